@@ -41,7 +41,7 @@ def init_db(reset_mode=False):
 
     # ... (前 3 张表 scan_batches, market_snapshots, trade_plans 保持不变，此处省略，代码里保留即可) ...
     # 为了完整性，我把它们简写在这里，你的文件里请保留原样
-    c.execute('''CREATE TABLE IF NOT EXISTS scan_batches (batch_id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT, strategy_name TEXT, market_vix REAL, universe_size INTEGER, avg_abs_edge REAL, cheap_vol_pct REAL, elapsed_time REAL)''')
+    c.execute('''CREATE TABLE IF NOT EXISTS scan_batches (batch_id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT, strategy_name TEXT, market_vix REAL, universe_size INTEGER, avg_abs_edge REAL, cheap_vol_pct REAL, elapsed_time REAL, ts_unix INTEGER)''')
     c.execute('''CREATE TABLE IF NOT EXISTS market_snapshots (snapshot_id INTEGER PRIMARY KEY AUTOINCREMENT, batch_id INTEGER, symbol TEXT, price REAL, iv_short REAL, iv_base REAL, edge REAL, hv_rank REAL, regime TEXT, FOREIGN KEY(batch_id) REFERENCES scan_batches(batch_id))''')
     c.execute('''CREATE TABLE IF NOT EXISTS trade_plans (id INTEGER PRIMARY KEY AUTOINCREMENT, snapshot_id INTEGER, strategy_type TEXT, cal_score INTEGER, short_risk INTEGER, gate_status TEXT, total_gamma REAL, est_debit REAL, error_msg TEXT, blueprint_json TEXT, tag TEXT, FOREIGN KEY(snapshot_id) REFERENCES market_snapshots(snapshot_id))''')
 
@@ -92,6 +92,18 @@ def init_db(reset_mode=False):
         )
     ''')
 
+    # --- 索引 (Dashboard 按 batch_id / timestamp / snapshot_id 查询) ---
+    print("   ... Checking indexes")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_ms_batch_sym ON market_snapshots(batch_id, symbol, price)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_sb_ts ON scan_batches(timestamp DESC, batch_id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_tp_snap ON trade_plans(snapshot_id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_tl_trade ON trade_legs(trade_id, leg_index)")
+    # 老库没有 ts_unix 列：补列 + 回填 (与 PersistenceManager 同一换算)
+    if "ts_unix" not in [r[1] for r in c.execute("PRAGMA table_info(scan_batches)")]:
+        c.execute("ALTER TABLE scan_batches ADD COLUMN ts_unix INTEGER")
+    c.execute("UPDATE scan_batches SET ts_unix = CAST(strftime('%s', timestamp) AS INTEGER) WHERE ts_unix IS NULL")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_sb_ts_unix ON scan_batches(ts_unix)")
+
     conn.commit()
     
     # 验证
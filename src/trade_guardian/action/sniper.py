@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Dict, Any, Optional, List
 from colorama import Fore, Style
 
+from trade_guardian.domain.chain import find_exp_key
 from trade_guardian.infra.schwab_client import SchwabClient
 from trade_guardian.action import sights, safety
 
@@ -64,11 +65,7 @@ class Sniper:
         return self.client._fetch_chain(symbol, exp, exp, range_val="ALL")
 
     def _list_strikes(self, exp_map: Dict[str, Any], exp: str) -> List[float]:
-        target_exp_key = None
-        for k in exp_map.keys():
-            if str(k).startswith(exp):
-                target_exp_key = k
-                break
+        target_exp_key = find_exp_key(exp_map, exp)
         if not target_exp_key:
             return []
         strikes_map = exp_map.get(target_exp_key) or {}
@@ -84,17 +81,20 @@ class Sniper:
     def _extract_quote(self, chain: Dict[str, Any], map_key: str, exp: str, strike: float) -> Optional[Dict[str, Any]]:
         exp_map = chain.get(map_key, {}) or {}
 
-        target_exp_key = None
-        for k in exp_map.keys():
-            if str(k).startswith(exp):
-                target_exp_key = k
-                break
+        target_exp_key = find_exp_key(exp_map, exp)
         if not target_exp_key:
             return None
 
         strikes_map = exp_map.get(target_exp_key) or {}
         target = float(strike)
 
+        # Schwab strike key 形如 "150.0"：精确 key 直接 O(1) 命中，不必逐个 float() 解析
+        q_list = strikes_map.get(str(target))
+        if q_list is not None:
+            if q_list and isinstance(q_list, list):
+                return q_list[0] or None
+            return None
+
         for s_str, q_list in strikes_map.items():
             try:
                 s_val = float(s_str)
@@ -3,14 +3,17 @@ from __future__ import annotations
 import os
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, date
-from typing import List, Tuple, Optional, Any
+from typing import List, Tuple, Optional, Any, Iterable, Iterator
 
+import numpy as np
 import pandas as pd
 from colorama import Fore, Style
 
-from trade_guardian.domain.models import Context, ScanRow, Blueprint, OrderLeg, TermPoint
+from trade_guardian.domain.models import Context, ScanRow, Blueprint, OrderLeg, TermPoint, Regime
 from trade_guardian.app.persistence import PersistenceManager
+from trade_guardian.domain.greeks import atm_gamma
 from trade_guardian.strategies.blueprint import build_straddle_blueprint
 from trade_guardian.infra.rate_limit import RateLimiter
 
@@ -18,7 +21,42 @@ from trade_guardian.infra.rate_limit import RateLimiter
 DEFAULT_GAMMA_SOFT = 0.24
 DEFAULT_GAMMA_HARD = 0.32
 
-LEV_ETFS = ["TQQQ", "SQQQ", "SOXL", "SOXS", "TSLL", "TSLS", "NVDL", "LABU", "UVXY"]
+LEV_ETFS = frozenset({"TQQQ", "SQQQ", "SOXL", "SOXS", "TSLL", "TSLS", "NVDL", "LABU", "UVXY"})
+
+
+def evaluate_rows(strategy, ctxs: List[Context]) -> List[Optional[ScanRow]]:
+    """
+    策略评估：有 evaluate_batch 就走批量路径，失败则逐个 evaluate 兜底。
+    模块级函数，ProcessPool worker 里也用它。
+    """
+    batch_fn = getattr(strategy, "evaluate_batch", None)
+    if batch_fn is not None and len(ctxs) > 1:
+        try:
+            return batch_fn(ctxs)
+        except Exception as e:
+            print(f"{Fore.YELLOW}⚠️  evaluate_batch failed ({e}), falling back to per-symbol{Style.RESET_ALL}")
+
+    rows: List[Optional[ScanRow]] = []
+    for ctx in ctxs:
+        try:
+            rows.append(strategy.evaluate(ctx))
+        except Exception as e:
+            print(f"❌ CRASH on {ctx.symbol}: {e}")
+            rows.append(None)
+    return rows
+
+
+# --- ProcessPool worker 状态：策略对象在 initializer 里只传一次 ---
+_WORKER_STRATEGY = None
+
+
+def _init_eval_worker(strategy) -> None:
+    global _WORKER_STRATEGY
+    _WORKER_STRATEGY = strategy
+
+
+def _eval_chunk(ctxs: List[Context]) -> List[Optional[ScanRow]]:
+    return evaluate_rows(_WORKER_STRATEGY, ctxs)
 
 
 class TradeGuardian:
@@ -31,6 +69,10 @@ class TradeGuardian:
         self.tickers_path = cfg.get("paths", {}).get("tickers_csv", "data/tickers.csv")
         throttle = float(cfg.get("scan", {}).get("throttle_sec", 0.5))
         self.limiter = RateLimiter(throttle)
+        # 每攒够 N 个 Context 批量评估一次（策略实现了 evaluate_batch 时走向量化路径）
+        self.eval_batch_size = max(1, int(cfg.get("scan", {}).get("eval_batch_size", 16)))
+        # >1 时按 symbol 分片到 ProcessPool 并行评估；0/1 = 串行
+        self.eval_workers = int(cfg.get("scan", {}).get("eval_workers", 0) or 0)
 
         self.db = PersistenceManager()
         self.last_batch_df: Optional[pd.DataFrame] = None
@@ -117,17 +159,12 @@ class TradeGuardian:
         print(HEADER)
         print("-" * WIDTH)
 
-        for ticker in tickers:
-            self.limiter.sleep()
+        current_strategy = self.strategy if self.strategy else self._load_strategy(strategy_name)
 
-            try:
-                ctx = self.client.build_context(ticker, days=days)
-                if not ctx:
-                    print(f"{Fore.RED}⚠️  SKIP {ticker:<5} | Reason: No Context{Style.RESET_ALL}")
-                    continue
+        for ctx, row in self._evaluated(current_strategy, self._contexts(tickers, days)):
+            ticker = ctx.symbol
 
-                current_strategy = self.strategy if self.strategy else self._load_strategy(strategy_name)
-                row = current_strategy.evaluate(ctx)
+            try:
                 if not row:
                     print(f"{Fore.YELLOW}⚠️  SKIP {ticker:<5} | Reason: Strategy Eval None{Style.RESET_ALL}")
                     continue
@@ -178,14 +215,14 @@ class TradeGuardian:
                 # Shape calc (use synchronized meta)
                 # -------------------------
                 tsf = ctx.tsf or {}
-                regime = str(tsf.get("regime", "FLAT"))
+                regime = Regime.of(tsf)
                 is_squeeze = bool(tsf.get("is_squeeze", False))
 
                 em = float(row.meta.get("edge_micro", 0.0) or 0.0)
                 ek = float(row.meta.get("edge_month", 0.0) or 0.0)
 
                 shape = "FLAT"
-                if regime == "BACKWARDATION":
+                if regime == Regime.BACKWARDATION:
                     shape = "BACKWARD"
                 elif ek >= 0.20 and em < 0.08:
                     shape = "FFBS"
@@ -307,6 +344,85 @@ class TradeGuardian:
     # -------------------------
     # Helpers (DTE / Term IV)
     # -------------------------
+    # -------------------------
+    # Scan Phases: fetch -> batch evaluate
+    # -------------------------
+    def _contexts(self, tickers: List[str], days: int) -> Iterator[Context]:
+        for ticker in tickers:
+            self.limiter.sleep()
+            try:
+                ctx = self.client.build_context(ticker, days=days)
+            except Exception as e:
+                print(f"❌ CRASH on {ticker}: {e}")
+                continue
+            if not ctx:
+                print(f"{Fore.RED}⚠️  SKIP {ticker:<5} | Reason: No Context{Style.RESET_ALL}")
+                continue
+            yield ctx
+
+    def _evaluated(self, strategy, contexts: Iterable[Context]) -> Iterator[Tuple[Context, Optional[ScanRow]]]:
+        pool = self._open_eval_pool(strategy)
+        try:
+            chunk: List[Context] = []
+            for ctx in contexts:
+                chunk.append(ctx)
+                if len(chunk) >= self.eval_batch_size:
+                    yield from zip(chunk, self._evaluate_all(strategy, chunk, pool))
+                    chunk = []
+            if chunk:
+                yield from zip(chunk, self._evaluate_all(strategy, chunk, pool))
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+    def _open_eval_pool(self, strategy) -> Optional[ProcessPoolExecutor]:
+        if self.eval_workers <= 1:
+            return None
+        try:
+            return ProcessPoolExecutor(
+                max_workers=self.eval_workers,
+                initializer=_init_eval_worker,
+                initargs=(strategy,),
+            )
+        except Exception as e:
+            print(f"{Fore.YELLOW}⚠️  ProcessPool unavailable ({e}), evaluating serially{Style.RESET_ALL}")
+            return None
+
+    @staticmethod
+    def _fill_missing_gamma(ctxs: List[Context]) -> None:
+        """
+        链上 gamma 缺失 (<=0) 的 symbol，用 BS ATM gamma 整批补齐 ctx.metrics.gamma。
+        有真实 gamma 的不动。
+        """
+        todo = [c for c in ctxs if c.metrics is not None and not float(c.metrics.gamma or 0.0) > 0]
+        if not todo:
+            return
+        S = np.array([float(c.price) for c in todo])
+        f = [c.ts_factors() for c in todo]
+        sigma = np.array([x.short_iv / 100.0 for x in f])
+        T = np.array([max(1, x.short_dte) / 365.0 for x in f])
+        for c, g in zip(todo, atm_gamma(S, sigma, T).tolist()):
+            c.metrics.gamma = g
+
+    def _evaluate_all(
+        self, strategy, ctxs: List[Context], pool: Optional[ProcessPoolExecutor] = None
+    ) -> List[Optional[ScanRow]]:
+        self._fill_missing_gamma(ctxs)
+        if pool is None or len(ctxs) < 2:
+            return evaluate_rows(strategy, ctxs)
+
+        # 按 symbol 均分给各 worker，每片内部仍走 evaluate_batch
+        size = -(-len(ctxs) // self.eval_workers)
+        shards = [ctxs[i:i + size] for i in range(0, len(ctxs), size)]
+        try:
+            rows: List[Optional[ScanRow]] = []
+            for part in pool.map(_eval_chunk, shards):
+                rows.extend(part)
+            return rows
+        except Exception as e:
+            print(f"{Fore.YELLOW}⚠️  Parallel eval failed ({e}), falling back to serial{Style.RESET_ALL}")
+            return evaluate_rows(strategy, ctxs)
+
     def _dte_from_exp(self, exp: str) -> int:
         try:
             d = datetime.strptime(str(exp), "%Y-%m-%d").date()
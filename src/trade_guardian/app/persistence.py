@@ -1,9 +1,32 @@
 import sqlite3
 import os
 import json
+import threading
 from datetime import datetime
 from dataclasses import asdict
 
+# Dashboard 热路径查询用到的索引 (幂等，可反复执行)
+#   idx_ms_batch_sym: 覆盖 "SELECT symbol, price ... WHERE batch_id = ?"，不回表
+#   idx_sb_ts:        按 timestamp 文本查找
+#   idx_sb_ts_unix:   radar 查 10m / 1h 前批次的 "ts_unix <= ?" 整数范围查找
+#   idx_tp_snap:      radar JOIN / 按 snapshot_id 取 blueprint
+#   idx_tl_trade:     fetch_active_trades 按 trade_id IN (...) 批量取 legs，顺带按 leg_index 有序
+INDEX_DDL = (
+    "CREATE INDEX IF NOT EXISTS idx_ms_batch_sym ON market_snapshots(batch_id, symbol, price)",
+    "CREATE INDEX IF NOT EXISTS idx_sb_ts ON scan_batches(timestamp DESC, batch_id)",
+    "CREATE INDEX IF NOT EXISTS idx_sb_ts_unix ON scan_batches(ts_unix)",
+    "CREATE INDEX IF NOT EXISTS idx_tp_snap ON trade_plans(snapshot_id)",
+    "CREATE INDEX IF NOT EXISTS idx_tl_trade ON trade_legs(trade_id, leg_index)",
+)
+
+# 长连接的 PRAGMA：WAL 让 dashboard 的读不阻塞扫描写入；NORMAL 在 WAL 下仍保证一致性
+# busy_timeout 必须最先设：切 WAL 要拿锁，否则碰上 dashboard 正在读会直接 "database is locked"
+_CONN_PRAGMAS = """
+PRAGMA busy_timeout=5000;
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+"""
+
 class PersistenceManager:
     def __init__(self, db_path=None):
         if db_path:
@@ -14,18 +37,79 @@ class PersistenceManager:
             self.db_path = os.path.join(project_root, "db", "trade_guardian.db")
 
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        # 整个实例共用一条连接 (dashboard 里经 st.cache_resource 跨 rerun / session 共享)，
+        # sqlite3 连接不是线程安全的，所有访问都经 _acquire / _release 串行化
+        self._lock = threading.RLock()
+        self._conn = self._connect()
+        self._ensure_indexes()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.executescript(_CONN_PRAGMAS)
+        return conn
+
+    def _acquire(self):
+        self._lock.acquire()
+        return self._conn
+
+    def _release(self, conn):
+        """
+        归还连接。方法内异常被吞掉、没走到 commit 时，回滚残留事务
+        (原来每次 close() 会隐式丢弃；共享连接上不回滚会把半截写入带进下一次调用)。
+        """
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        finally:
+            self._lock.release()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _ensure_indexes(self):
+        conn = self._acquire()
+        try:
+            self._migrate_ts_unix(conn)
+            for ddl in INDEX_DDL:
+                try:
+                    conn.execute(ddl)
+                except sqlite3.OperationalError:
+                    # 表还没建 (create_tg_db.py 未运行)，跳过
+                    pass
+            conn.commit()
+        finally:
+            self._release(conn)
+
+    @staticmethod
+    def _migrate_ts_unix(conn):
+        """
+        scan_batches.ts_unix: 由 SQLite strftime('%s', timestamp) 得到的整数秒。
+        只用于批次之间做差 (10m / 1h 前)，写入和查询都走同一个换算，不涉及时区。
+        """
+        try:
+            cols = [r[1] for r in conn.execute("PRAGMA table_info(scan_batches)")]
+            if not cols:
+                return
+            if "ts_unix" not in cols:
+                conn.execute("ALTER TABLE scan_batches ADD COLUMN ts_unix INTEGER")
+            conn.execute(
+                "UPDATE scan_batches SET ts_unix = CAST(strftime('%s', timestamp) AS INTEGER) WHERE ts_unix IS NULL"
+            )
+        except sqlite3.OperationalError:
+            pass
 
     def save_scan_session(self, strategy_name, vix, count, avg_edge, cheap_vol, elapsed, results_pack):
-        conn = sqlite3.connect(self.db_path)
+        conn = self._acquire()
         c = conn.cursor()
         
         try:
             current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
             c.execute("""INSERT INTO scan_batches 
-                      (timestamp, strategy_name, market_vix, universe_size, avg_abs_edge, cheap_vol_pct, elapsed_time) 
-                      VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                      (current_time, strategy_name, vix, count, avg_edge, cheap_vol, elapsed))
+                      (timestamp, strategy_name, market_vix, universe_size, avg_abs_edge, cheap_vol_pct, elapsed_time, ts_unix) 
+                      VALUES (?, ?, ?, ?, ?, ?, ?, CAST(strftime('%s', ?) AS INTEGER))""",
+                      (current_time, strategy_name, vix, count, avg_edge, cheap_vol, elapsed, current_time))
             batch_id = c.lastrowid
             
             for item in results_pack:
@@ -63,7 +147,7 @@ class PersistenceManager:
             traceback.print_exc()
             print(f"❌ [DB Error] Save failed: {e}")
         finally:
-            conn.close()
+            self._release(conn)
 
     def record_order(self, snapshot_id: int, symbol: str, strategy: str, 
                      limit_price: float, quantity: int, 
@@ -72,7 +156,7 @@ class PersistenceManager:
         """
         [V2 Refactor] 写入主交易表 + 拆解写入腿部表
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._acquire()
         c = conn.cursor()
         current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
@@ -119,15 +203,15 @@ class PersistenceManager:
             print(f"❌ [DB Error] Failed to record order: {e}")
             return None
         finally:
-            conn.close()
+            self._release(conn)
 
     def fetch_active_trades(self):
         """
         [V2 Refactor] 获取交易主表，并附带查询子表数据
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self._acquire()
         c = conn.cursor()
+        c.row_factory = sqlite3.Row
         try:
             # 1. 获取主表
             c.execute("""
@@ -136,29 +220,37 @@ class PersistenceManager:
                 ORDER BY trade_id DESC
             """)
             trades = [dict(row) for row in c.fetchall()]
-            
-            # 2. 为每个交易填充 Legs
+            if not trades:
+                return trades
+
+            # 2. 一次查出所有 Legs，再按 trade_id 分组挂载 (替代每个交易一条查询的 N+1)
+            legs_by_tid = {t['trade_id']: [] for t in trades}
+            c.execute("""
+                SELECT l.* FROM trade_legs l
+                JOIN active_trades t ON t.trade_id = l.trade_id
+                WHERE t.status IN ('WORKING', 'OPEN')
+                ORDER BY l.trade_id, l.leg_index ASC
+            """)
+            for r in c.fetchall():
+                bucket = legs_by_tid.get(r['trade_id'])
+                if bucket is not None:
+                    bucket.append(dict(r))
+
             for t in trades:
-                c.execute("""
-                    SELECT * FROM trade_legs 
-                    WHERE trade_id = ? 
-                    ORDER BY leg_index ASC
-                """, (t['trade_id'],))
-                legs = [dict(r) for r in c.fetchall()]
-                t['legs'] = legs # 直接挂载 List[Dict]
-                
+                t['legs'] = legs_by_tid[t['trade_id']] # 直接挂载 List[Dict]
+
             return trades
         except Exception as e:
             print(f"❌ [DB Error] Fetch trades failed: {e}")
             return []
         finally:
-            conn.close()
+            self._release(conn)
 
     def update_trade_status(self, trade_id: int, new_status: str, fill_price: float = None):
         """
         [V2] 更新主状态，同时处理子状态
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._acquire()
         c = conn.cursor()
         current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
@@ -189,20 +281,20 @@ class PersistenceManager:
             print(f"❌ [DB Error] Update failed: {e}")
             return False
         finally:
-            conn.close()
+            self._release(conn)
             
     def update_leg_prices(self, trade_id: int, leg_updates: list):
         """
         leg_updates: [(leg_id, current_price), ...]
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._acquire()
         c = conn.cursor()
         try:
             for leg_id, px in leg_updates:
                 c.execute("UPDATE trade_legs SET current_price = ? WHERE leg_id = ?", (px, leg_id))
             conn.commit()
         finally:
-            conn.close()
+            self._release(conn)
 
 
     # [NEW] 批量更新腿部的开仓价格 (用于 Confirm Fill 时记录单腿成本)
@@ -210,7 +302,7 @@ class PersistenceManager:
         """
         legs_data: list of dicts, must contain 'leg_index' and 'live_price'
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._acquire()
         c = conn.cursor()
         try:
             for leg in legs_data:
@@ -230,4 +322,4 @@ class PersistenceManager:
         except Exception as e:
             print(f"❌ [DB Error] Failed to update leg prices: {e}")
         finally:
-            conn.close()
\ No newline at end of file
+            self._release(conn)
\ No newline at end of file
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from trade_guardian.domain.models import Context
+from trade_guardian.infra.jit import njit
+
+# Schwab chain: raw_chain["callExpDateMap"]["YYYY-MM-DD:dte"]["strike"] = [quote]
+SIDE_MAP_KEYS = {"CALL": "callExpDateMap", "PUT": "putExpDateMap"}
+
+
+def build_exp_index(chain: dict) -> Dict[str, Dict[str, str]]:
+    """
+    {"CALL": {"YYYY-MM-DD": "YYYY-MM-DD:dte"}, "PUT": {...}}
+    替代每次查询时对 exp_map.keys() 做 startswith 扫描。
+    """
+    index: Dict[str, Dict[str, str]] = {}
+    for side, map_key in SIDE_MAP_KEYS.items():
+        side_idx: Dict[str, str] = {}
+        for k in (chain.get(map_key) or {}).keys():
+            side_idx.setdefault(k.split(":", 1)[0], k)
+        index[side] = side_idx
+    return index
+
+
+def find_exp_key(exp_map: Optional[dict], exp: str) -> Optional[str]:
+    """
+    在单边 exp_map (callExpDateMap / putExpDateMap) 里找以 exp 开头的 key。
+    无状态的线性扫描 (到期日通常只有几十个)，可被多线程并发调用；
+    手里有 Context 的调用方走 exp_key()，索引缓存在 ctx.cache 里、随链一起释放。
+    """
+    if not exp_map:
+        return None
+    exp = str(exp)
+    for k in exp_map.keys():
+        if str(k).startswith(exp):
+            return k
+    return None
+
+
+def exp_index(ctx: Context) -> Dict[str, Dict[str, str]]:
+    """按 Context 缓存的 exp 索引（一条链只建一次）。"""
+    idx = ctx.cache.get("exp_index")
+    if idx is None:
+        idx = build_exp_index(ctx.raw_chain or {})
+        ctx.cache["exp_index"] = idx
+    return idx
+
+
+def exp_key(ctx: Context, exp: str, side: str) -> Optional[str]:
+    return exp_index(ctx)[side].get(exp)
+
+
+def exp_arrays(ctx: Context, exp: str, side: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    单次遍历某个到期日，解析为按 strike 升序的 (strikes, deltas, marks)。
+    mark 缺失时用 (bid+ask)/2。结果缓存在 ctx.cache，同一 ctx 内所有策略共用。
+    """
+    cache_key = ("exp_arrays", exp, side)
+    hit = ctx.cache.get(cache_key)
+    if hit is not None:
+        return hit
+
+    exp_map = (ctx.raw_chain or {}).get(SIDE_MAP_KEYS[side], {})
+    target_key = exp_key(ctx, exp, side)
+
+    strikes, deltas, marks = array("d"), array("d"), array("d")
+    if target_key:
+        for s_str, quotes in exp_map[target_key].items():
+            try:
+                q = quotes[0]
+                strike = float(s_str)
+                delta = float(q.get("delta", 0.0))
+                px = float(q.get("mark") or (float(q.get("bid", 0)) + float(q.get("ask", 0))) / 2.0)
+            except (TypeError, ValueError, IndexError, AttributeError):
+                continue
+            strikes.append(strike)
+            deltas.append(delta)
+            marks.append(px)
+
+    strikes_np = np.frombuffer(strikes, dtype=np.float64)
+    order = np.argsort(strikes_np, kind="stable")
+    parsed = (
+        strikes_np[order],
+        np.frombuffer(deltas, dtype=np.float64)[order],
+        np.frombuffer(marks, dtype=np.float64)[order],
+    )
+    ctx.cache[cache_key] = parsed
+    return parsed
+
+
+@njit(cache=True)
+def _best_delta_match(abs_deltas, targets, min_abs_delta):
+    """
+    对每个目标 delta 返回 |delta| 最接近的下标（并列取靠前的 strike）；没有可用合约时为 -1。
+    abs_deltas 需为 |delta|，低于 min_abs_delta 的跳过。
+    Schwab 链里 delta 可能是 NaN：显式跳过，且不开 fastmath (否则 LLVM 假定无 NaN，比较结果不可靠)。
+    """
+    out = np.empty(targets.size, np.int64)
+    for j in range(targets.size):
+        t = targets[j]
+        best = np.inf
+        bi = -1
+        for i in range(abs_deltas.size):
+            d = abs_deltas[i]
+            if np.isnan(d) or d < min_abs_delta:
+                continue
+            diff = abs(d - t)
+            if diff < best:
+                best = diff
+                bi = i
+        out[j] = bi
+    return out
+
+
+def pick_by_delta(
+    ctx: Context, exp: str, side: str, targets: Tuple[float, ...], min_abs_delta: float = 0.01
+) -> Optional[List[Tuple[float, float, float]]]:
+    """
+    一次解析，同时为多个目标 delta 选腿：返回 [(strike, mark, delta), ...]，顺序同 targets。
+    |delta| < min_abs_delta 的深度虚值合约不参与匹配；整个到期日都没有可用合约时返回 None。
+    """
+    strikes, deltas, marks = exp_arrays(ctx, exp, side)
+    idx = _best_delta_match(np.abs(deltas), np.asarray(targets, dtype=np.float64), min_abs_delta)
+    if idx.size == 0 or idx[0] < 0:
+        return None
+    return [(float(strikes[i]), float(marks[i]), float(deltas[i])) for i in idx.tolist()]
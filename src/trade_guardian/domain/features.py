@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Dict, List
 
-from trade_guardian.domain.models import HVInfo, TermPoint
+from trade_guardian.domain.models import HVInfo, TermPoint, Regime, Curvature
 from trade_guardian.domain.policy import ShortLegPolicy
 
 
@@ -57,6 +57,8 @@ class TSFeatureBuilder:
             "status": "Success",
             "regime": regime,
             "curvature": curv,
+            "regime_code": Regime[regime],
+            "curvature_code": Curvature[curv],
             "short_exp": short.exp,
             "short_dte": short.dte,
             "short_iv": short.iv,
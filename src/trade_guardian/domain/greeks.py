@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+def atm_gamma(S: np.ndarray, sigma: np.ndarray, T: np.ndarray) -> np.ndarray:
+    """
+    Black-Scholes ATM gamma，整批向量化计算（log(S/K)=0 近似）:
+        d1    = 0.5 * sigma * sqrt(T)
+        gamma = exp(-d1^2 / 2) / (S * sigma * sqrt(2*pi*T))
+
+    S: 标的价格, sigma: 年化波动率(小数), T: 年化到期时间。
+    输入非法 (<=0) 的位置返回 0.0。
+    """
+    S = np.asarray(S, dtype=np.float64)
+    sigma = np.asarray(sigma, dtype=np.float64)
+    T = np.asarray(T, dtype=np.float64)
+
+    ok = (S > 0) & (sigma > 0) & (T > 0)
+    S_, sig_, T_ = np.where(ok, S, 1.0), np.where(ok, sigma, 1.0), np.where(ok, T, 1.0)
+
+    d1 = 0.5 * sig_ * np.sqrt(T_)
+    gamma = np.exp(-0.5 * d1 * d1) / (S_ * sig_ * np.sqrt(2.0 * np.pi * T_))
+    return np.where(ok, gamma, 0.0)
@@ -1,7 +1,35 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
+from enum import IntEnum
 from typing import List, Optional, Dict, Any
 
+
+# --- 期限结构形态编码 (TSF 里与字符串并存：字符串给展示/入库，code 给热路径比较) ---
+
+class Regime(IntEnum):
+    FLAT = 0
+    CONTANGO = 1
+    BACKWARDATION = 2
+
+    @classmethod
+    def of(cls, tsf: dict) -> "Regime":
+        code = tsf.get("regime_code")
+        if code is not None:
+            return code
+        return cls.__members__.get(str(tsf.get("regime", "FLAT")), cls.FLAT)
+
+
+class Curvature(IntEnum):
+    NORMAL = 0
+    SPIKY_FRONT = 1
+
+    @classmethod
+    def of(cls, tsf: dict) -> "Curvature":
+        code = tsf.get("curvature_code")
+        if code is not None:
+            return code
+        return cls.__members__.get(str(tsf.get("curvature", "NORMAL")), cls.NORMAL)
+
 # --- 基础设施类 (用于 SchwabClient 等) ---
 
 @dataclass
@@ -43,6 +71,60 @@ class IVData:
     hv_rank: float = 0.0
     current_hv: float = 0.0
 
+@dataclass(slots=True)
+class TSF:
+    """
+    ctx.tsf 的强类型视图（每个 Context 构造一次），热路径用属性访问代替 dict.get。
+    ctx.tsf dict 保持不变（入库 / meta 拷贝仍用它）。
+    """
+    regime: str = "FLAT"
+    curvature: str = "NORMAL"
+    regime_code: Regime = Regime.FLAT
+    curvature_code: Curvature = Curvature.NORMAL
+    is_squeeze: bool = False
+
+    short_exp: str = ""
+    short_dte: int = 0
+    short_iv: float = 0.0
+    edge_micro: float = 0.0
+    edge_month: float = 0.0
+
+    # 以下原样透传（可能缺失 -> None）
+    nearest_exp: Optional[str] = None
+    nearest_dte: Optional[int] = None
+    nearest_iv: Optional[float] = None
+    micro_exp: Optional[str] = None
+    micro_dte: Optional[int] = None
+    micro_iv: Optional[float] = None
+    month_exp: Optional[str] = None
+    month_dte: Optional[int] = None
+    month_iv: Optional[float] = None
+    diag_long_exp: Optional[str] = None
+    diag_long_dte: Optional[int] = None
+    diag_long_iv: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "TSF":
+        get = d.get
+        return cls(
+            str(get("regime") or "FLAT"), str(get("curvature") or "NORMAL"),
+            Regime.of(d), Curvature.of(d), bool(get("is_squeeze", False)),
+            str(get("short_exp") or ""), int(get("short_dte") or 0), float(get("short_iv") or 0.0),
+            float(get("edge_micro") or 0.0), float(get("edge_month") or 0.0),
+            get("nearest_exp"), get("nearest_dte"), get("nearest_iv"),
+            get("micro_exp"), get("micro_dte"), get("micro_iv"),
+            get("month_exp"), get("month_dte"), get("month_iv"),
+            get("diag_long_exp"), get("diag_long_dte"), get("diag_long_iv"),
+        )
+
+
+@dataclass
+class Metrics:
+    """短腿 Greeks 快照 (build_context 填充)。模块级定义，保证 Context 可 pickle。"""
+    gamma: float = 0.0
+    delta: float = 0.0
+    theta: float = 0.0
+
 @dataclass
 class Context:
     symbol: str
@@ -54,8 +136,17 @@ class Context:
     metrics: Any = None 
     # [FIX] P0-1: 增加 term 字段，防止 Calendar 策略报错
     term: List[TermPoint] = field(default_factory=list) 
+    # 单个 Context 生命周期内的解析缓存（链解析结果等），随 ctx 一起释放
+    cache: Dict[Any, Any] = field(default_factory=dict, repr=False, compare=False)
+    # tsf 的 TSF 视图；build_context 里直接构造，其它来源的 Context 首次访问时惰性生成
+    factors: Optional[TSF] = field(default=None, repr=False, compare=False)
 
-@dataclass
+    def ts_factors(self) -> TSF:
+        if self.factors is None:
+            self.factors = TSF.from_dict(self.tsf or {})
+        return self.factors
+
+@dataclass(slots=True)
 class ScoreBreakdown:
     base: int = 0
     regime: int = 0
@@ -64,7 +155,7 @@ class ScoreBreakdown:
     curvature: int = 0
     penalties: int = 0
 
-@dataclass
+@dataclass(slots=True)
 class RiskBreakdown:
     base: int = 0
     dte: int = 0
@@ -73,7 +164,7 @@ class RiskBreakdown:
     curvature: int = 0
     penalties: int = 0
 
-@dataclass
+@dataclass(slots=True)
 class ScanRow:
     symbol: str
     price: float
@@ -94,6 +185,24 @@ class ScanRow:
     # 允许动态挂载 blueprint
     blueprint: Optional[Blueprint] = None
 
+    @classmethod
+    def from_tuple(
+        cls,
+        symbol: str, price: float,
+        short_exp: str, short_dte: int, short_iv: float,
+        base_iv: float, edge: float, hv_rank: float,
+        regime: str, curvature: str, tag: str,
+        cal_score: int, short_risk: int,
+        score_breakdown: ScoreBreakdown, risk_breakdown: RiskBreakdown,
+        meta: Optional[Dict[str, Any]] = None, blueprint: Optional[Blueprint] = None,
+    ) -> "ScanRow":
+        """热路径用的纯位置参数构造（无 kwargs 打包）。参数顺序即字段顺序。"""
+        return cls(
+            symbol, price, short_exp, short_dte, short_iv, base_iv, edge, hv_rank,
+            regime, curvature, tag, cal_score, short_risk, score_breakdown, risk_breakdown,
+            {} if meta is None else meta, blueprint,
+        )
+
 @dataclass
 class Recommendation:
     strategy: str
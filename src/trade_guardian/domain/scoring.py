@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from bisect import bisect_left
 from dataclasses import dataclass
 
 from trade_guardian.domain.models import ScoreBreakdown
@@ -25,6 +26,14 @@ class ScoringRules:
 class Scoring:
     def __init__(self, rules: ScoringRules):
         self.rules = rules
+        # (low, mid] 等区间都是右闭 => bisect_left
+        self._hv_breaks = (float(rules.hv_low_rank), float(rules.hv_mid_rank), float(rules.hv_high_rank))
+        self._hv_values = (
+            int(rules.hv_low_bonus),
+            int(rules.hv_mid_bonus),
+            int(rules.hv_high_penalty),
+            int(rules.hv_extreme_penalty),
+        )
 
     def _hv_points(self, hv_rank: float) -> int:
         """
@@ -36,13 +45,10 @@ class Scoring:
             return 0
 
         r = float(hv_rank)
-        if r <= self.rules.hv_low_rank:
-            return int(self.rules.hv_low_bonus)
-        if r <= self.rules.hv_mid_rank:
-            return int(self.rules.hv_mid_bonus)
-        if r <= self.rules.hv_high_rank:
-            return int(self.rules.hv_high_penalty)
-        return int(self.rules.hv_extreme_penalty)
+        # NaN (没有 HV 数据) 与原 if/elif 阶梯一致落到最后一档；bisect 会把它放进第 0 档 (bonus)
+        if r != r:
+            return self._hv_values[-1]
+        return self._hv_values[bisect_left(self._hv_breaks, r)]
 
     def score_calendar(self, regime: str, curvature: str, edge: float, hv_rank: float) -> tuple[int, ScoreBreakdown]:
         """
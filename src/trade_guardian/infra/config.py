@@ -16,6 +16,8 @@ DEFAULT_CONFIG: Dict[str, Any] = {
     "scan": {
         "throttle_sec": 0.50,
         "contract_type": "ALL",
+        "eval_batch_size": 16,
+        "eval_workers": 0,
     },
     "rules": {
         "min_edge_short_base": 1.05,
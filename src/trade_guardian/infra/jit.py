@@ -0,0 +1,32 @@
+"""
+Optional numba JIT.
+
+numba 不是硬依赖：安装了就把数值 kernel 编译成机器码，
+没安装时 njit 退化为 no-op 装饰器，kernel 以纯 Python 运行（结果一致，只是慢）。
+
+    pip install "trade-guardian[jit]"
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+try:
+    from numba import njit as _numba_njit
+
+    HAS_NUMBA = True
+except ImportError:
+    _numba_njit = None
+    HAS_NUMBA = False
+
+
+def njit(*args: Any, **kwargs: Any):
+    """
+    Drop-in for numba.njit. Supports both `@njit` and `@njit(sig, cache=True, ...)`.
+    """
+    if HAS_NUMBA:
+        return _numba_njit(*args, **kwargs)
+
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+    return lambda fn: fn
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import math
 import requests
 import numpy as np
 import pandas as pd
@@ -8,7 +9,7 @@ from datetime import datetime, timedelta, date
 from urllib.parse import quote
 from typing import Optional, Any, List, Dict, Tuple
 
-from trade_guardian.domain.models import Context, IVData, HVInfo, TermPoint
+from trade_guardian.domain.models import Context, IVData, HVInfo, TermPoint, Regime, Curvature, Metrics, TSF
 from trade_guardian.infra.schwab_token_manager import fetch_schwab_token
 
 
@@ -407,7 +408,7 @@ class SchwabClient:
                 else:
                     def _momentum_score(p: TermPoint) -> float:
                         d_eff = max(1, int(p.dte))
-                        return (float(p.iv) - nearest_iv_base) / np.sqrt(d_eff)
+                        return (float(p.iv) - nearest_iv_base) / math.sqrt(d_eff)
                     micro_point = max(micro_pool, key=_momentum_score)
 
             if not micro_point:
@@ -430,6 +431,8 @@ class SchwabClient:
             tsf = {
                 "regime": regime,
                 "curvature": curvature,
+                "regime_code": Regime[regime],
+                "curvature_code": Curvature[curvature],
                 "is_squeeze": is_squeeze,
 
                 "short_exp": short_point.exp,
@@ -464,13 +467,11 @@ class SchwabClient:
                 current_hv=float(hv_info.current_hv),
             )
 
-            class Metrics:
-                pass
-
-            metrics = Metrics()
-            metrics.gamma = float(short_point.gamma)
-            metrics.delta = float(short_point.delta)
-            metrics.theta = float(short_point.theta)
+            metrics = Metrics(
+                gamma=float(short_point.gamma),
+                delta=float(short_point.delta),
+                theta=float(short_point.theta),
+            )
 
             return Context(
                 symbol=symbol,
@@ -480,6 +481,7 @@ class SchwabClient:
                 tsf=tsf,
                 raw_chain=raw_chain,
                 metrics=metrics,
+                factors=TSF.from_dict(tsf),
                 term=term_points,
             )
 
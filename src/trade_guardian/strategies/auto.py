@@ -1,13 +1,13 @@
 from __future__ import annotations
 from typing import Optional, Tuple
-from trade_guardian.domain.models import Context, Recommendation, ScanRow
+from trade_guardian.domain.models import Context, Recommendation, ScanRow, Regime
 from trade_guardian.domain.policy import ShortLegPolicy
 from trade_guardian.strategies.base import Strategy
 from trade_guardian.strategies.diagonal import DiagonalStrategy
 from trade_guardian.strategies.long_gamma import LongGammaStrategy
 from trade_guardian.strategies.vertical_credit import VerticalCreditStrategy
 
-LEV_ETFS = ["TQQQ", "SQQQ", "SOXL", "SOXS", "TSLL", "TSLS", "NVDL", "LABU", "UVXY"]
+LEV_ETFS = frozenset({"TQQQ", "SQQQ", "SOXL", "SOXS", "TSLL", "TSLS", "NVDL", "LABU", "UVXY"})
 
 class AutoStrategy(Strategy):
     name = "auto"
@@ -22,13 +22,13 @@ class AutoStrategy(Strategy):
     def evaluate(self, ctx: Context) -> ScanRow:
         hv_rank = float(ctx.hv.hv_rank)
         tsf = ctx.tsf
-        regime = str(tsf.get("regime", "FLAT"))
+        regime = Regime.of(tsf)
         edge_month = float(tsf.get("edge_month", 0.0))
         current_iv = float(ctx.iv.current_iv)
         is_lev_etf = ctx.symbol in LEV_ETFS
 
         # 1. [倒挂保护] Backwardation -> 强制 Long Gamma (防守)
-        if regime == "BACKWARDATION":
+        if regime == Regime.BACKWARDATION:
             row = self.long_gamma.evaluate(ctx)
             row.tag = "LG-DEFENSE"
             return row
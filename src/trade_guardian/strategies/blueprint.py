@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import Optional, Dict, Any
 
+from trade_guardian.domain.chain import SIDE_MAP_KEYS, find_exp_key
 from trade_guardian.domain.models import Blueprint, OrderLeg
 
 
@@ -9,36 +10,45 @@ from trade_guardian.domain.models import Blueprint, OrderLeg
 # Quote Helpers
 # =============================================================================
 
-def _extract_quote_full(chain: Dict[str, Any], side: str, exp: str, strike: float) -> Dict[str, float]:
+def _strike_quote(chain: Dict[str, Any], side: str, exp: str, strike: float) -> Optional[Dict[str, Any]]:
     """
-    Return {"bid": x, "ask": y, "mid": z}.
-    - "mid" uses mark if valid (>0), else falls back to (bid+ask)/2 only if both bid/ask > 0.
-    - If not found or insufficient data, returns zeros.
+    side -> exp bucket -> strike 的 quotes[0]，找不到返回 None。
+    quote / greeks 两个 helper 共用这一次定位，不再各自走一遍 side_key 判断和到期日查找。
     """
-    side_key = "callExpDateMap" if side.upper() == "CALL" else "putExpDateMap"
-    side_map = chain.get(side_key, {}) or {}
+    side_map = chain.get(SIDE_MAP_KEYS["CALL" if side.upper() == "CALL" else "PUT"], {}) or {}
 
     # Find the matching expiry bucket
-    target_key = None
-    for k in side_map.keys():
-        if str(k).startswith(exp):
-            target_key = k
-            break
+    target_key = find_exp_key(side_map, exp)
     if not target_key:
-        return {"bid": 0.0, "ask": 0.0, "mid": 0.0}
+        return None
 
     strikes_map = side_map.get(target_key, {}) or {}
+    strike = float(strike)
+
+    # Schwab strike key 形如 "150.0"：先试精确 key，再退回容差扫描
+    quotes = strikes_map.get(str(strike))
+    if quotes:
+        return quotes[0]
 
-    # Find the matching strike
-    quote0 = None
     for s_key, quotes in strikes_map.items():
+        if not quotes:
+            continue
         try:
-            if abs(float(s_key) - float(strike)) < 0.01 and quotes:
-                quote0 = quotes[0]
-                break
-        except Exception:
+            k = float(s_key)
+        except (TypeError, ValueError):
             continue
+        if abs(k - strike) < 0.01:
+            return quotes[0]
+    return None
+
 
+def _extract_quote_full(chain: Dict[str, Any], side: str, exp: str, strike: float) -> Dict[str, float]:
+    """
+    Return {"bid": x, "ask": y, "mid": z}.
+    - "mid" uses mark if valid (>0), else falls back to (bid+ask)/2 only if both bid/ask > 0.
+    - If not found or insufficient data, returns zeros.
+    """
+    quote0 = _strike_quote(chain, side, exp, strike)
     if not quote0:
         return {"bid": 0.0, "ask": 0.0, "mid": 0.0}
 
@@ -64,27 +74,7 @@ def _extract_mid_for(chain: Dict[str, Any], side: str, exp: str, strike: float)
 
 
 def _extract_greeks_for(chain: Dict[str, Any], side: str, exp: str, strike: float) -> Dict[str, float]:
-    side_key = "callExpDateMap" if side.upper() == "CALL" else "putExpDateMap"
-    exp_map = chain.get(side_key, {}) or {}
-
-    target_key = None
-    for k in exp_map.keys():
-        if str(k).startswith(exp):
-            target_key = k
-            break
-    if not target_key:
-        return {}
-
-    strikes_map = exp_map.get(target_key, {}) or {}
-    quote0 = None
-    for s_str, q_list in strikes_map.items():
-        try:
-            if abs(float(s_str) - float(strike)) < 0.01 and q_list:
-                quote0 = q_list[0]
-                break
-        except Exception:
-            continue
-
+    quote0 = _strike_quote(chain, side, exp, strike)
     if not quote0:
         return {}
 
@@ -153,11 +143,7 @@ def build_straddle_blueprint(
 ) -> Optional[Blueprint]:
     call_map = chain.get("callExpDateMap", {}) or {}
 
-    target_key = None
-    for k in call_map.keys():
-        if str(k).startswith(exp):
-            target_key = k
-            break
+    target_key = find_exp_key(call_map, exp)
 
     if not target_key:
         return Blueprint(symbol=symbol, strategy="STRADDLE", legs=[], est_debit=0.0, error="Expiry Not Found")
@@ -167,7 +153,7 @@ def build_straddle_blueprint(
     for s in strike_keys:
         try:
             strikes.append(float(s))
-        except Exception:
+        except (TypeError, ValueError):
             continue
     strikes.sort()
 
@@ -246,11 +232,7 @@ def build_calendar_blueprint(
 ) -> Optional[Blueprint]:
     call_map = chain.get("callExpDateMap", {}) or {}
 
-    target_key = None
-    for k in call_map.keys():
-        if str(k).startswith(short_exp):
-            target_key = k
-            break
+    target_key = find_exp_key(call_map, short_exp)
     if not target_key:
         return None
 
@@ -259,7 +241,7 @@ def build_calendar_blueprint(
     for s in strike_keys:
         try:
             strikes.append(float(s))
-        except Exception:
+        except (TypeError, ValueError):
             continue
     strikes.sort()
 
@@ -77,11 +77,8 @@ class CalendarStrategy:
         # Normalize gamma: if we have rank0_gamma use it; otherwise fall back to max gamma in eligible term
         denom = rank0_gamma if rank0_gamma and rank0_gamma > 0 else 0.0
         if denom <= 0:
-            # fallback: max gamma among term points we have
-            try:
-                denom = max(float(p.gamma) for p in ctx.term if p.gamma is not None)  # type: ignore
-            except Exception:
-                denom = 0.0
+            # fallback: max gamma among term points we have (empty term -> 0)
+            denom = max((float(p.gamma) for p in (ctx.term or []) if p.gamma is not None), default=0.0)
 
         g = float(short_gamma) if short_gamma is not None else 0.0
         g_norm = (g / denom) if denom > 0 else 0.0
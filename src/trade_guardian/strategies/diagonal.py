@@ -6,6 +6,7 @@ from typing import Optional, Tuple, List, Dict, Any
 from trade_guardian.domain.models import (
     Context, Recommendation, ScanRow, ScoreBreakdown, RiskBreakdown, Blueprint, TermPoint
 )
+from trade_guardian.domain.chain import find_exp_key
 from trade_guardian.domain.policy import ShortLegPolicy
 from trade_guardian.strategies.base import Strategy
 from trade_guardian.strategies.blueprint import build_diagonal_blueprint
@@ -125,9 +126,9 @@ class DiagonalStrategy(Strategy):
         keys = list(call_map.keys())
 
         # 1) exact startswith match
-        for k in keys:
-            if str(k).startswith(str(exp_iso)):
-                return k
+        k = find_exp_key(call_map, exp_iso)
+        if k is not None:
+            return k
 
         # 2) dte hint match (handles cases where exp_iso mismatch but DTE aligns)
         if dte_hint is not None:
@@ -172,6 +173,14 @@ class DiagonalStrategy(Strategy):
         if not isinstance(strikes_map, dict) or not strikes_map:
             return None
 
+        # strike key 只解析一次，SHORT / LONG 和 fallback 共用
+        parsed: List[Tuple[float, Any]] = []
+        for s_str, q_list in strikes_map.items():
+            try:
+                parsed.append((float(s_str), q_list))
+            except (TypeError, ValueError):
+                continue
+
         candidates: List[Tuple[float, float, float]] = []
         # tuple: (score, strike, delta)
 
@@ -181,11 +190,7 @@ class DiagonalStrategy(Strategy):
             dmax = float(self.short_call_delta_max)
             min_strike = float(spot) * (1.0 + float(self.short_call_otm_min_pct))
 
-            for s_str, q_list in strikes_map.items():
-                try:
-                    strike = float(s_str)
-                except Exception:
-                    continue
+            for strike, q_list in parsed:
                 if strike < min_strike:
                     continue
                 if not q_list:
@@ -219,11 +224,7 @@ class DiagonalStrategy(Strategy):
             dmin = float(self.long_call_delta_min)
             dmax = float(self.long_call_delta_max)
 
-            for s_str, q_list in strikes_map.items():
-                try:
-                    strike = float(s_str)
-                except Exception:
-                    continue
+            for strike, q_list in parsed:
                 # ITM / near-ITM: strike <= spot
                 if strike > spot:
                     continue
@@ -257,15 +258,9 @@ class DiagonalStrategy(Strategy):
             return float(candidates[0][1])
 
         # fallback (no candidates): keep old simple behavior but safer
-        strike_list: List[float] = []
-        for s_str in strikes_map.keys():
-            try:
-                strike_list.append(float(s_str))
-            except Exception:
-                continue
+        strike_list = sorted(strike for strike, _ in parsed)
         if not strike_list:
             return None
-        strike_list.sort()
 
         if want == "SHORT":
             # fallback: choose further OTM than before (>= spot*(1+otm_min_pct))
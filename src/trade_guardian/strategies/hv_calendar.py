@@ -134,12 +134,11 @@ class HVCalendarStrategy(CalendarStrategy):
             cal_score=int(score),
             short_risk=int(risk),
             score_breakdown=bd,
+            risk_breakdown=rbd,
+            # ScanRow 是 slots dataclass，不能再 setattr 挂额外字段，explain 字段放 meta
+            meta={"squeeze_ratio": squeeze_ratio},
         )
 
-        # renderer 用 getattr，所以我们用 setattr 挂上 explain 字段
-        setattr(row, "risk_breakdown", rbd)
-        setattr(row, "squeeze_ratio", squeeze_ratio)
-
         return row
 
     def recommend(self, ctx: Context, min_score: int, max_risk: int) -> Tuple[Optional[Recommendation], str]:
@@ -2,11 +2,68 @@ from __future__ import annotations
 from typing import Optional, Dict, Any, Tuple, List
 
 from trade_guardian.domain.models import (
-    Context, ScanRow, Blueprint, OrderLeg, ScoreBreakdown, RiskBreakdown, Recommendation
+    Context, ScanRow, Blueprint, OrderLeg, ScoreBreakdown, RiskBreakdown, Recommendation, Regime
 )
 from trade_guardian.domain.policy import ShortLegPolicy
+from trade_guardian.domain.chain import pick_by_delta
+from trade_guardian.infra.jit import njit
 from trade_guardian.strategies.base import Strategy
 
+# tag_code -> tag (bit0: 宽翅膀模式, bit1: RICH)
+_IC_TAGS = ("IC-STD", "IC-WIDE", "IC-STD-RICH", "IC-WIDE-RICH")
+
+
+@njit(
+    "Tuple((int64, int64, float64, float64, float64, float64, int64))"
+    "(float64, float64, float64, float64, float64, float64, float64, float64, float64, float64, boolean)",
+    cache=True,
+)
+def _ic_arith(p_sp, p_lp, p_sc, p_lc, s_put_k, l_put_k, s_call_k, l_call_k, hv_rank, wing_delta, is_back):
+    """
+    IC 报价之后的全部数值逻辑 (credit / width / RoR / score / risk / tag)。
+    Returns: (score, risk, credit, max_risk, ror, max_width, tag_code)
+    """
+    credit = (p_sp - p_lp) + (p_sc - p_lc)
+    max_width = max(s_put_k - l_put_k, l_call_k - s_call_k)
+
+    max_risk = max_width - credit
+    if max_risk <= 0:
+        max_risk = 0.1
+    ror = credit / max_risk
+
+    # [自动适应评分]
+    # 如果是宽翅膀 (Delta <= 0.05)，RoR 阈值自动降低
+    # 如果是标准 IC (Delta >= 0.10)，RoR 阈值保持较高
+    wide = wing_delta <= 0.06
+    score = 50
+
+    if hv_rank > 50: score += 10
+    if hv_rank > 80: score += 10
+    if hv_rank < 30: score -= 20
+
+    if wide:
+        # === 宽翅膀评分标准 (IRA Mode) ===
+        if ror > 0.18: score += 15
+        elif ror > 0.12: score += 5
+        elif ror < 0.10: score -= 15
+    else:
+        # === 标准 IC 评分标准 (Standard Mode) ===
+        if ror > 0.30: score += 15
+        elif ror > 0.20: score += 5
+        elif ror < 0.15: score -= 10
+
+    if is_back:
+        score -= 30
+
+    # 根据模式打不同的 Tag，方便前台区分
+    tag_code = 1 if wide else 0
+    if ror > (0.20 if wide else 0.35):
+        tag_code += 2
+
+    risk = max(0, 100 - score)
+    return score, risk, credit, max_risk, ror, max_width, tag_code
+
+
 class IronCondorStrategy(Strategy):
     """
     Strategy: Iron Condor (Flexible / Wide Wing Mode)
@@ -29,61 +86,6 @@ class IronCondorStrategy(Strategy):
         # 默认就是您想要的 0.05 Delta (宽翅膀/退休账户模式)
         self.wing_delta = self.cfg.get("wing_delta", 0.05) 
 
-    def _find_strike_by_delta(self, chain: Dict, exp: str, side: str, target_delta: float) -> Optional[float]:
-        map_key = "callExpDateMap" if side == "CALL" else "putExpDateMap"
-        exp_map = chain.get(map_key, {})
-        
-        target_key = None
-        for k in exp_map.keys():
-            if k.startswith(exp):
-                target_key = k
-                break
-        if not target_key: return None
-
-        best_strike = None
-        # [修改点] 使用 float('inf') 代表正无穷大，这是最标准的写法
-        min_diff = float('inf') 
-        
-        strikes_data = exp_map[target_key]
-        for s_str, quotes in strikes_data.items():
-            try:
-                strike = float(s_str)
-                quote = quotes[0]
-                d = abs(float(quote.get("delta", 0.0))) 
-                
-                if d < 0.001: continue 
-                
-                diff = abs(d - target_delta)
-                
-                # 任何实数 diff 都会小于 float('inf')，逻辑完美
-                if diff < min_diff:
-                    min_diff = diff
-                    best_strike = strike
-            except: continue
-            
-        return best_strike
-
-    def _get_quote_data(self, chain: Dict, exp: str, side: str, strike: float) -> Tuple[float, float]:
-        map_key = "callExpDateMap" if side == "CALL" else "putExpDateMap"
-        for k, v in chain.get(map_key, {}).items():
-            if k.startswith(exp):
-                strike_key = f"{strike:.1f}"
-                found_quotes = None
-                if strike_key in v:
-                    found_quotes = v[strike_key]
-                else:
-                    for s_key, q_list in v.items():
-                        if abs(float(s_key) - strike) < 0.01:
-                            found_quotes = q_list
-                            break
-                
-                if found_quotes:
-                    q = found_quotes[0]
-                    px = float(q.get("mark") or (float(q.get("bid",0)) + float(q.get("ask",0)))/2.0)
-                    delta = float(q.get("delta", 0.0))
-                    return px, delta
-        return 0.0, 0.0
-
     def evaluate(self, ctx: Context) -> ScanRow:
         hv_rank = float(ctx.hv.hv_rank)
         
@@ -94,62 +96,27 @@ class IronCondorStrategy(Strategy):
             return self._empty_row(ctx, score=0, risk=99, note="DTE < 20")
 
         # [使用配置参数]
-        s_put_k = self._find_strike_by_delta(ctx.raw_chain, exp, "PUT", self.short_delta)
-        l_put_k = self._find_strike_by_delta(ctx.raw_chain, exp, "PUT", self.wing_delta)
-        
-        s_call_k = self._find_strike_by_delta(ctx.raw_chain, exp, "CALL", self.short_delta)
-        l_call_k = self._find_strike_by_delta(ctx.raw_chain, exp, "CALL", self.wing_delta)
-
-        if not all([s_put_k, l_put_k, s_call_k, l_call_k]):
+        # 每一侧一次选出 short + wing 两条腿（strike / mark / delta 一起返回）
+        targets = (self.short_delta, self.wing_delta)
+        puts = pick_by_delta(ctx, exp, "PUT", targets, min_abs_delta=0.001)
+        calls = pick_by_delta(ctx, exp, "CALL", targets, min_abs_delta=0.001)
+        # pick_by_delta 要么返回 None，要么每个 target 都有完整的一条腿
+        if puts is None or calls is None:
              return self._empty_row(ctx, score=0, risk=99, note="Legs Missing")
+        (s_put_k, p_sp, d_sp), (l_put_k, p_lp, d_lp) = puts
+        (s_call_k, p_sc, d_sc), (l_call_k, p_lc, d_lc) = calls
         
         price = ctx.price
         # 简单的逻辑检查
         if not (l_put_k < s_put_k < price < s_call_k < l_call_k):
              return self._empty_row(ctx, score=0, risk=99, note="Inv Strikes")
 
-        p_sp, d_sp = self._get_quote_data(ctx.raw_chain, exp, "PUT", s_put_k)
-        p_lp, d_lp = self._get_quote_data(ctx.raw_chain, exp, "PUT", l_put_k)
-        p_sc, d_sc = self._get_quote_data(ctx.raw_chain, exp, "CALL", s_call_k)
-        p_lc, d_lc = self._get_quote_data(ctx.raw_chain, exp, "CALL", l_call_k)
-        
-        credit = (p_sp - p_lp) + (p_sc - p_lc)
-        width_put = s_put_k - l_put_k
-        width_call = l_call_k - s_call_k
-        max_width = max(width_put, width_call)
-        
-        max_risk = max_width - credit
-        if max_risk <= 0: max_risk = 0.1
-        
-        ror = credit / max_risk
-
-        # [自动适应评分]
-        # 如果是宽翅膀 (Delta <= 0.05)，RoR 阈值自动降低
-        # 如果是标准 IC (Delta >= 0.10)，RoR 阈值保持较高
-        score = 50
-        
-        if hv_rank > 50: score += 10
-        if hv_rank > 80: score += 10
-        if hv_rank < 30: score -= 20
-        
-        if self.wing_delta <= 0.06:
-            # === 宽翅膀评分标准 (IRA Mode) ===
-            if ror > 0.18: score += 15
-            elif ror > 0.12: score += 5
-            elif ror < 0.10: score -= 15
-        else:
-            # === 标准 IC 评分标准 (Standard Mode) ===
-            if ror > 0.30: score += 15
-            elif ror > 0.20: score += 5
-            elif ror < 0.15: score -= 10
-        
-        if ctx.tsf.get("regime") == "BACKWARDATION":
-            score -= 30 
-            
-        # 根据模式打不同的 Tag，方便前台区分
-        tag = "IC-WIDE" if self.wing_delta <= 0.06 else "IC-STD"
-        if ror > (0.20 if self.wing_delta <= 0.06 else 0.35):
-            tag += "-RICH"
+        score, calc_risk, credit, max_risk, ror, max_width, tag_code = _ic_arith(
+            p_sp, p_lp, p_sc, p_lc,
+            s_put_k, l_put_k, s_call_k, l_call_k,
+            hv_rank, self.wing_delta, Regime.of(ctx.tsf) == Regime.BACKWARDATION,
+        )
+        tag = _IC_TAGS[tag_code]
         
         legs = [
             OrderLeg(ctx.symbol, "SELL", 1, exp, s_put_k, "PUT"),
@@ -168,32 +135,16 @@ class IronCondorStrategy(Strategy):
         )
         bp.short_greeks = {"delta": d_sc}
 
-        calc_risk = max(0, 100 - score)
-
-        row = ScanRow(
-            symbol=ctx.symbol,
-            price=ctx.price,
-            short_exp=exp,
-            short_dte=dte,
-            short_iv=ctx.iv.current_iv,
-            base_iv=ctx.tsf.get("month_iv", 0),
-            edge=ctx.tsf.get("edge_month", 0),
-            hv_rank=hv_rank,
-            regime=str(ctx.tsf.get("regime")),
-            curvature="NORMAL",
-            tag=tag,
-            cal_score=int(score),
-            short_risk=int(calc_risk),
-            score_breakdown=ScoreBreakdown(base=50),
-            risk_breakdown=RiskBreakdown(base=0),
-            meta={
-                "credit": credit, 
-                "width": max_width,
-                "wing_delta": self.wing_delta
-            }
+        return ScanRow.from_tuple(
+            ctx.symbol, ctx.price,
+            exp, dte, ctx.iv.current_iv,
+            ctx.tsf.get("month_iv", 0), ctx.tsf.get("edge_month", 0), hv_rank,
+            str(ctx.tsf.get("regime")), "NORMAL", tag,
+            int(score), int(calc_risk),
+            ScoreBreakdown(base=50), RiskBreakdown(base=0),
+            {"credit": credit, "width": max_width, "wing_delta": self.wing_delta},
+            bp,
         )
-        row.blueprint = bp
-        return row
 
     def _empty_row(self, ctx, score, risk, note):
         # 保持原有结构
@@ -205,14 +156,13 @@ class IronCondorStrategy(Strategy):
             error=note,
             note=note
         )
-        return ScanRow(
-            symbol=ctx.symbol,
-            price=ctx.price,
-            short_exp="N/A", short_dte=0, short_iv=0.0, base_iv=0.0, edge=0.0, 
-            hv_rank=float(ctx.hv.hv_rank), regime="N/A", curvature="N/A", 
-            tag="IC-FAIL", cal_score=score, short_risk=risk,
-            score_breakdown=ScoreBreakdown(), risk_breakdown=RiskBreakdown(),
-            meta={"error": note}, blueprint=bp
+        return ScanRow.from_tuple(
+            ctx.symbol, ctx.price,
+            "N/A", 0, 0.0, 0.0, 0.0, float(ctx.hv.hv_rank),
+            "N/A", "N/A", "IC-FAIL",
+            score, risk,
+            ScoreBreakdown(), RiskBreakdown(),
+            {"error": note}, bp,
         )
 
     def recommend(self, ctx: Context, min_score: int, max_risk: int) -> Tuple[Optional[Recommendation], str]:
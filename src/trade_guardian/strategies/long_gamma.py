@@ -1,10 +1,83 @@
 from __future__ import annotations
-from typing import Tuple, List
+import math
+from typing import Tuple, List, Optional
+
+import numpy as np
+
 from trade_guardian.domain.models import Context, ScanRow, ScoreBreakdown, RiskBreakdown, Blueprint
 from trade_guardian.domain.policy import ShortLegPolicy
+from trade_guardian.domain.chain import SIDE_MAP_KEYS, exp_key
 from trade_guardian.strategies.base import Strategy
+from trade_guardian.infra.jit import njit
+
+ETF_SET = frozenset({"SPY", "QQQ", "IWM", "TQQQ", "SQQQ", "SOXL", "SOXS", "TSLL", "TSLS", "NVDL", "UVXY", "TLT"})
+# LG 禁止开仓的标的 (Gate -> FORBID)
+_FORBID = frozenset({"TSLL", "TQQQ", "SOXL", "ONDS", "SMCI"})
+
+# evaluate_batch 用的 SoA 表：一行一个 symbol
+LG_TSF_DTYPE = np.dtype([
+    ("edge_micro", "f8"),
+    ("edge_month", "f8"),
+    ("short_dte", "i8"),
+    ("short_iv", "f8"),
+    ("price", "f8"),
+])
+
+
+def score_batch(tsf_table: np.ndarray) -> np.ndarray:
+    """
+    向量化版评分：与 evaluate() 中的标量评分完全一致。
+      score = 60 + int(clamp(edge_micro*40, -20, 20)) + int(clamp(edge_month*60, -20, 30))
+    int() 向零截断 => np.trunc
+    edge 缺失 (NaN/inf) 的行记 0 分，与 _lg_kernel 一致；先置 0 再 astype，避免 NaN 转成 int64 最小值。
+    """
+    edge_micro = tsf_table["edge_micro"]
+    edge_month = tsf_table["edge_month"]
+    ok = np.isfinite(edge_micro) & np.isfinite(edge_month)
+    score = 60.0
+    score = score + np.trunc(np.clip(edge_micro * 40, -20, 20))
+    score = score + np.trunc(np.clip(edge_month * 60, -20, 30))
+    return np.where(ok, np.clip(score, 0, 100), 0.0).astype(np.int64)
+
+
+# tag_code: bit0 = Micro 边际 (-M), bit1 = Month 边际 (-K)
+_LG_TAGS = ("LG", "LG-M", "LG-K", "LG-M-K")
+
+
+@njit("Tuple((int64, int64, float64))(float64, float64, float64)", cache=True)
+def _lg_kernel(edge_micro, edge_month, chain_gamma):
+    """
+    标量热路径：score / tag_code / est_gamma。与 score_batch 的评分规则一致。
+    edge 缺失 (NaN/inf) 时 score = 0、不打 tag：int(NaN) 在纯 Python 下会抛 ValueError，在 numba 下结果未定义。
+    """
+    if not (math.isfinite(edge_micro) and math.isfinite(edge_month)):
+        return 0, 0, chain_gamma * 2.0
+
+    a = edge_micro * 40.0
+    if a < -20.0:
+        a = -20.0
+    elif a > 20.0:
+        a = 20.0
+    b = edge_month * 60.0
+    if b < -20.0:
+        b = -20.0
+    elif b > 30.0:
+        b = 30.0
+
+    score = 60 + int(a) + int(b)
+    if score < 0:
+        score = 0
+    elif score > 100:
+        score = 100
+
+    tag_code = 0
+    if edge_micro > 0.15:
+        tag_code |= 1
+    if edge_month > 0.30:
+        tag_code |= 2
+
+    return score, tag_code, chain_gamma * 2.0
 
-ETF_LIST = ["SPY", "QQQ", "IWM", "TQQQ", "SQQQ", "SOXL", "SOXS", "TSLL", "TSLS", "NVDL", "UVXY", "TLT"]
 
 class LongGammaStrategy(Strategy):
     name = "long_gamma"
@@ -20,42 +93,46 @@ class LongGammaStrategy(Strategy):
         self.pin_coeff = self.rules.get("pin_risk_coeff", 0.3)
         self.max_spread = self.rules.get("lg_max_spread_pct", 0.08)
 
-    @staticmethod
-    def _clamp(x: float, lo: float, hi: float) -> float:
-        return max(lo, min(hi, x))
-
-    def _strikes_from_chain(self, ctx: Context, exp: str, side: str="CALL") -> List[float]:
+    def _strikes_from_chain(self, ctx: Context, exp: str, side: str="CALL") -> np.ndarray:
         """
         [FIX] 直接从 raw_chain 获取该到期日的所有 Strike，用于算真实 Step
+        结果缓存在 ctx.cache，同一条链只解析一次。
         """
-        key = "callExpDateMap" if side=="CALL" else "putExpDateMap"
-        m = ctx.raw_chain.get(key, {}) or {}
-        
-        target_key = None
-        for k in m.keys():
-            if k.startswith(exp):
-                target_key = k
-                break
-        
-        if target_key and target_key in m:
-            return sorted([float(s) for s in m[target_key].keys()])
-        return []
+        cache_key = ("lg_strikes", exp, side)
+        hit = ctx.cache.get(cache_key)
+        if hit is not None:
+            return hit
+
+        m = ctx.raw_chain.get(SIDE_MAP_KEYS[side], {}) or {}
+        target_key = exp_key(ctx, exp, side)
+
+        keys = m[target_key].keys() if target_key else ()
+        strikes = np.sort(np.fromiter((float(k) for k in keys), dtype=np.float64, count=len(keys)))
+        ctx.cache[cache_key] = strikes
+        return strikes
 
     def _get_real_strike_step(self, ctx: Context, exp: str) -> float:
+        cache_key = ("lg_step", exp, round(float(ctx.price), 2))
+        hit = ctx.cache.get(cache_key)
+        if hit is not None:
+            return hit
+        step = self._calc_real_strike_step(ctx, exp)
+        ctx.cache[cache_key] = step
+        return step
+
+    def _calc_real_strike_step(self, ctx: Context, exp: str) -> float:
         strikes = self._strikes_from_chain(ctx, exp)
         if len(strikes) < 2: return 1.0
 
         # 只看 ATM 附近 10 个 strike
-        center_idx = min(range(len(strikes)), key=lambda i: abs(strikes[i] - ctx.price))
-        start = max(0, center_idx - 5)
-        end = min(len(strikes), center_idx + 5)
-        subset = strikes[start:end]
-        
-        diffs = [subset[i+1] - subset[i] for i in range(len(subset)-1)]
-        if not diffs: return 1.0
-        
+        center_idx = int(np.abs(strikes - ctx.price).argmin())
+        subset = strikes[max(0, center_idx - 5):center_idx + 5]
+
         # 取最小正差值
-        return min(d for d in diffs if d > 0)
+        diffs = np.diff(subset)
+        diffs = diffs[diffs > 0]
+        if not diffs.size: return 1.0
+        return float(diffs.min())
 
     def _check_pin_risk(self, ctx: Context, price: float, dte: int, exp: str) -> Tuple[bool, str]:
         if dte > 3: return False, ""
@@ -73,100 +150,122 @@ class LongGammaStrategy(Strategy):
 
     def _empty_row(self, ctx, note):
         bd = ScoreBreakdown(base=0)
-        return ScanRow(
-            symbol=ctx.symbol, price=float(ctx.price),
-            short_exp="N/A", short_dte=0, short_iv=0, base_iv=0, edge=0, hv_rank=0,
-            regime="N/A", curvature="N/A", tag="LG-FAIL",
-            cal_score=0, short_risk=99,
-            score_breakdown=bd, risk_breakdown=RiskBreakdown(),
-            meta={"error": note},
-            blueprint=Blueprint(ctx.symbol, "LG-FAIL", [], 0.0, error=note, note=note)
+        return ScanRow.from_tuple(
+            ctx.symbol, float(ctx.price),
+            "N/A", 0, 0, 0, 0, 0,
+            "N/A", "N/A", "LG-FAIL",
+            0, 99,
+            bd, RiskBreakdown(),
+            {"error": note},
+            Blueprint(ctx.symbol, "LG-FAIL", [], 0.0, error=note, note=note),
         )
 
-    def evaluate(self, ctx: Context) -> ScanRow:
-        tsf = ctx.tsf
-        symbol = ctx.symbol
-        price = float(ctx.price)
-
-        # ============ [DEBUG START] ============
-        # 打印 TSF 里的核心数据，看看是不是这里就是 0
-        # s_dte = tsf.get("short_dte", "None")
-        # s_iv = tsf.get("short_iv", "None")
-        # print(f"🧐 [DEBUG-LOGIC] {symbol} Checking LG Logic...")
-        # print(f"   -> TSF Data: DTE={s_dte}, IV={s_iv}, EdgeM={tsf.get('edge_micro')}")
-        # ============ [DEBUG END] ==============
-        
-        short_iv = float(tsf.get("short_iv", 0.0))
-        edge_micro = float(tsf.get("edge_micro", 0.0))
-        edge_month = float(tsf.get("edge_month", 0.0))
-        short_dte = int(tsf.get("short_dte", 0))
-        short_exp = str(tsf.get("short_exp", ""))
-        
+    def _kill_gate(self, ctx: Context, short_dte: int, short_exp: str) -> Optional[ScanRow]:
         # 1. DTE Hard Kill
-        is_etf = symbol in ETF_LIST
+        is_etf = ctx.symbol in ETF_SET
         min_dte = self.min_dte_etf if is_etf else self.min_dte_stock
         has_catalyst = False 
         
         if short_dte < min_dte and not has_catalyst:
-            # ============ [DEBUG START] ============
-            #print(f"   🚫 [BLOCK] DTE Kill: {short_dte} < {min_dte}")
-            # ============ [DEBUG END] ==============
             return self._empty_row(ctx, f"DTE {short_dte} < {min_dte} (Theta Risk)")
 
         # 2. Pin Risk Hard Kill (Data-Driven)
-        is_pinned, pin_msg = self._check_pin_risk(ctx, price, short_dte, short_exp)
+        is_pinned, pin_msg = self._check_pin_risk(ctx, float(ctx.price), short_dte, short_exp)
         if is_pinned:
             return self._empty_row(ctx, pin_msg)
+        return None
+
+    def evaluate(self, ctx: Context) -> ScanRow:
+        f = ctx.ts_factors()
+        short_dte = f.short_dte
+        short_exp = f.short_exp
+
+        # Kill gate 先走：被拒的行不需要读 IV / Edge
+        killed = self._kill_gate(ctx, short_dte, short_exp)
+        if killed:
+            return killed
+
+        short_iv = f.short_iv
+        edge_micro = f.edge_micro
+        edge_month = f.edge_month
 
         # 3. 评分逻辑
-        score = 60
-        score += int(self._clamp(edge_micro * 40, -20, 20))
-        score += int(self._clamp(edge_month * 60, -20, 30))
-        score = self._clamp(score, 0, 100)
+        chain_gamma = float(ctx.metrics.gamma) if ctx.metrics else 0.0
+        score, tag_code, est_gamma = _lg_kernel(edge_micro, edge_month, chain_gamma)
+
+        return self._build_row(
+            ctx, int(score), int(tag_code), float(est_gamma),
+            short_exp, short_dte, short_iv, edge_micro, edge_month,
+        )
+
+    def evaluate_batch(self, ctxs: List[Context]) -> List[ScanRow]:
+        """
+        批量评估：评分一次性向量化计算，只在最后逐行构造 ScanRow。
+        """
+        n = len(ctxs)
+        table = np.zeros(n, dtype=LG_TSF_DTYPE)
+        for i, ctx in enumerate(ctxs):
+            f = ctx.ts_factors()
+            table[i] = (f.edge_micro, f.edge_month, f.short_dte, f.short_iv, float(ctx.price))
+
+        scores = score_batch(table)
+        tag_codes = (table["edge_micro"] > 0.15).astype(np.int64) | ((table["edge_month"] > 0.30).astype(np.int64) << 1)
+        # 与 _lg_kernel 一致：任一 edge 非有限值时不打 tag (inf > 0.30 否则会置位)
+        tag_codes[~(np.isfinite(table["edge_micro"]) & np.isfinite(table["edge_month"]))] = 0
+
+        # 列一次性转成 Python 标量，循环里不再做结构化数组的字段索引
+        score_l, tag_l = scores.tolist(), tag_codes.tolist()
+        dte_l, iv_l = table["short_dte"].tolist(), table["short_iv"].tolist()
+        em_l, ek_l = table["edge_micro"].tolist(), table["edge_month"].tolist()
+        kill_gate, build_row = self._kill_gate, self._build_row
+
+        rows: List[ScanRow] = []
+        append = rows.append
+        for i, ctx in enumerate(ctxs):
+            short_dte = dte_l[i]
+            short_exp = ctx.ts_factors().short_exp
+            killed = kill_gate(ctx, short_dte, short_exp)
+            if killed:
+                append(killed)
+                continue
+            est_gamma = float(ctx.metrics.gamma) * 2.0 if ctx.metrics else 0.0
+            append(build_row(
+                ctx, score_l[i], tag_l[i], est_gamma, short_exp, short_dte,
+                iv_l[i], em_l[i], ek_l[i],
+            ))
+        return rows
+
+    def _build_row(
+        self, ctx: Context, score: int, tag_code: int, est_gamma: float, short_exp: str, short_dte: int,
+        short_iv: float, edge_micro: float, edge_month: float,
+    ) -> ScanRow:
+        f = ctx.ts_factors()
+        symbol = ctx.symbol
+        price = float(ctx.price)
 
         # 4. 构造 Gate
         gate = "WAIT"
         if score > 75 and edge_micro > 0.05 and edge_month > 0.10:
             gate = "READY"
         
-        if symbol in ["TSLL", "TQQQ", "SOXL", "ONDS", "SMCI"]:
+        if symbol in _FORBID:
              gate = "FORBID"
 
-        tag = "LG"
-        if edge_micro > 0.15: tag += "-M"
-        if edge_month > 0.30: tag += "-K"
+        tag = _LG_TAGS[tag_code]
 
         bd = ScoreBreakdown(base=60) 
         rbd = RiskBreakdown(base=20)
         
-        row = ScanRow(
-            symbol=symbol,
-            price=price,
-            short_exp=short_exp,
-            short_dte=short_dte,
-            short_iv=short_iv,
-            base_iv=tsf.get("month_iv", 0.0),
-            edge=edge_month,
-            hv_rank=50.0,
-            regime="NORMAL",
-            curvature="FLAT",
-            tag=tag,
-            cal_score=int(score),
-            short_risk=20,
-            score_breakdown=bd,
-            risk_breakdown=rbd,
-        )
-        
-        row.meta = {
-            "micro_exp": tsf.get("micro_exp"),
-            "micro_dte": tsf.get("micro_dte"),
-            "micro_iv": tsf.get("micro_iv"),
+        meta = {
+            "micro_exp": f.micro_exp,
+            "micro_dte": f.micro_dte,
+            "micro_iv": f.micro_iv,
             "edge_micro": edge_micro,
-            "month_exp": tsf.get("month_exp"),
-            "month_dte": tsf.get("month_dte"),
-            "month_iv": tsf.get("month_iv"),
+            "month_exp": f.month_exp,
+            "month_dte": f.month_dte,
+            "month_iv": f.month_iv,
             "edge_month": edge_month,
-            "est_gamma": float(ctx.metrics.gamma) * 2.0 if ctx.metrics else 0.0,
+            "est_gamma": est_gamma,
             "strike": round(price, 1),
             "max_spread_pct": self.max_spread, # 传递给 Orchestrator
             "stop_loss_rules": {
@@ -175,4 +274,12 @@ class LongGammaStrategy(Strategy):
                 "no_move_pct": self.rules.get("lg_no_move_frac", 0.25)
             }
         }
-        return row
\ No newline at end of file
+
+        return ScanRow.from_tuple(
+            symbol, price,
+            short_exp, short_dte, short_iv,
+            f.month_iv if f.month_iv is not None else 0.0, edge_month, 50.0,   # base_iv / edge / hv_rank
+            "NORMAL", "FLAT", tag,                        # regime / curvature / tag
+            int(score), 20,                               # cal_score / short_risk
+            bd, rbd, meta,
+        )
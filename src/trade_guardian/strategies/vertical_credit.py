@@ -1,12 +1,25 @@
 from __future__ import annotations
+from bisect import bisect_left
+from types import MappingProxyType
 from typing import Optional, Dict, Any, Tuple, List
 
+import numpy as np
+
 from trade_guardian.domain.models import (
     Context, ScanRow, Blueprint, OrderLeg, ScoreBreakdown, RiskBreakdown, Recommendation
 )
 from trade_guardian.domain.policy import ShortLegPolicy
+from trade_guardian.domain.chain import pick_by_delta
 from trade_guardian.strategies.base import Strategy
 
+# RoR 加分阶梯：(0.15, 0.25] -> +5, > 0.25 -> +15
+_ROR_BREAKS = (0.15, 0.25)
+_ROR_POINTS = (0, 5, 15)
+
+# ctx.tsf 为空时的只读占位，供 {**tsf, ...} 展开
+_EMPTY = MappingProxyType({})
+
+
 class VerticalCreditStrategy(Strategy):
     name = "vertical_credit"
 
@@ -14,81 +27,45 @@ class VerticalCreditStrategy(Strategy):
         self.cfg = cfg
         self.policy = policy
 
-    def _find_strike_by_delta(self, chain: Dict, exp: str, side: str, target_delta: float) -> Optional[float]:
-        map_key = "callExpDateMap" if side == "CALL" else "putExpDateMap"
-        exp_map = chain.get(map_key, {})
-        target_key = None
-        for k in exp_map.keys():
-            if k.startswith(exp):
-                target_key = k
-                break
-        if not target_key: return None
-
-        best_strike = None
-        min_diff = 999.0
-        strikes_data = exp_map[target_key]
-        for s_str, quotes in strikes_data.items():
-            try:
-                strike = float(s_str)
-                quote = quotes[0]
-                d = abs(float(quote.get("delta", 0.0))) 
-                if d < 0.01: continue 
-                diff = abs(d - target_delta)
-                if diff < min_diff:
-                    min_diff = diff
-                    best_strike = strike
-            except: continue
-        return best_strike
-
-    def _get_quote_data(self, chain: Dict, exp: str, side: str, strike: float) -> Tuple[float, float]:
-        map_key = "callExpDateMap" if side == "CALL" else "putExpDateMap"
-        for k, v in chain.get(map_key, {}).items():
-            if k.startswith(exp):
-                strike_key = f"{strike:.1f}"
-                found_quotes = None
-                if strike_key in v:
-                    found_quotes = v[strike_key]
-                else:
-                    for s_key, q_list in v.items():
-                        if abs(float(s_key) - strike) < 0.01:
-                            found_quotes = q_list
-                            break
-                if found_quotes:
-                    q = found_quotes[0]
-                    px = float(q.get("mark") or (float(q.get("bid",0)) + float(q.get("ask",0)))/2.0)
-                    delta = float(q.get("delta", 0.0))
-                    return px, delta
-        return 0.0, 0.0
-
-    def evaluate(self, ctx: Context) -> ScanRow:
-        hv_rank = float(ctx.hv.hv_rank)
+    def _resolve_legs(self, ctx: Context) -> Tuple[Optional[ScanRow], Optional[tuple]]:
+        """
+        结构性检查 + 选腿。失败返回 (FAIL 行, None)，成功返回 (None, legs)。
+        legs = (exp, side_short, side_long, s_strike, p_s, d_s, l_strike, p_l)
+        """
         exp = ctx.tsf.get("month_exp")
         dte = int(ctx.tsf.get("month_dte", 0))
         
         if not exp or dte < 15:
-            return self._empty_row(ctx, 0, 99, "DTE < 15")
+            return self._empty_row(ctx, 0, 99, "DTE < 15"), None
 
         side_short = "PUT"
         side_long = "PUT"
-        strat_tag = "BULL-PUT" if side_short == "PUT" else "BEAR-CALL"
         
-        s_strike = self._find_strike_by_delta(ctx.raw_chain, exp, side_short, 0.30)
-        l_strike = self._find_strike_by_delta(ctx.raw_chain, exp, side_long, 0.10)
+        picked = pick_by_delta(ctx, exp, side_short, (0.30, 0.10))
+        if not picked:
+             return self._empty_row(ctx, 0, 99, "Legs Missing (Delta?)"), None
+        (s_strike, p_s, d_s), (l_strike, p_l, d_l) = picked
 
         if not s_strike or not l_strike:
-             return self._empty_row(ctx, 0, 99, "Legs Missing (Delta?)")
+             return self._empty_row(ctx, 0, 99, "Legs Missing (Delta?)"), None
 
         price = ctx.price
         if side_short == "PUT":
             if not (l_strike < s_strike < price):
-                 return self._empty_row(ctx, 0, 99, "Inv Strikes (PCS)")
+                 return self._empty_row(ctx, 0, 99, "Inv Strikes (PCS)"), None
         else:
              if not (price < s_strike < l_strike):
-                 return self._empty_row(ctx, 0, 99, "Inv Strikes (CCS)")
+                 return self._empty_row(ctx, 0, 99, "Inv Strikes (CCS)"), None
+
+        return None, (exp, side_short, side_long, s_strike, p_s, d_s, l_strike, p_l)
+
+    def evaluate(self, ctx: Context, min_score: int = 0) -> ScanRow:
+        failed, legs = self._resolve_legs(ctx)
+        if failed:
+            return failed
+        hv_rank = float(ctx.hv.hv_rank)
+        _, _, _, s_strike, p_s, _, l_strike, p_l = legs
 
-        p_s, d_s = self._get_quote_data(ctx.raw_chain, exp, side_short, s_strike)
-        p_l, d_l = self._get_quote_data(ctx.raw_chain, exp, side_long, l_strike)
-        
         credit = p_s - p_l
         width = abs(s_strike - l_strike)
         max_risk = width - credit
@@ -97,72 +74,112 @@ class VerticalCreditStrategy(Strategy):
         ror = credit / max_risk
         score = 50
         if hv_rank > 50: score += 10
-        if ror > 0.25: score += 15
-        elif ror > 0.15: score += 5
-        
-        if score >= 70: strat_tag += "★"
-        
-        legs = [
-            OrderLeg(ctx.symbol, "SELL", 1, exp, s_strike, side_short),
-            OrderLeg(ctx.symbol, "BUY", 1, exp, l_strike, side_long)
-        ]
-        
-        bp = Blueprint(
-            symbol=ctx.symbol,
-            strategy=strat_tag.replace("★", ""),
-            legs=legs,
-            est_debit= -round(credit, 2),
-            note=f"Credit ${credit:.2f} | Risk ${max_risk:.2f} | RoR {ror:.1%}",
-            error=None,
-            short_greeks={"delta": d_s}
+        score += _ROR_POINTS[bisect_left(_ROR_BREAKS, ror)]
+
+        # 低于 min_score 的行 recommend 会直接丢弃：不拷 meta、不挂 blueprint
+        return self._build_row(ctx, legs, hv_rank, credit, width, max_risk, ror, score, lite=score < min_score)
+
+    def evaluate_batch(self, ctxs: List[Context]) -> List[ScanRow]:
+        """
+        批量评估：选腿仍是逐个 symbol，credit / RoR / score 在 SoA 数组上一次算完。
+        """
+        rows: List[Optional[ScanRow]] = [None] * len(ctxs)
+        live: List[Tuple[int, tuple]] = []
+        for i, ctx in enumerate(ctxs):
+            failed, legs = self._resolve_legs(ctx)
+            if failed:
+                rows[i] = failed
+            else:
+                live.append((i, legs))
+        if not live:
+            return rows
+
+        hv = np.array([float(ctxs[i].hv.hv_rank) for i, _ in live])
+        s_k = np.array([legs[3] for _, legs in live])
+        p_s = np.array([legs[4] for _, legs in live])
+        l_k = np.array([legs[6] for _, legs in live])
+        p_l = np.array([legs[7] for _, legs in live])
+
+        credit = p_s - p_l
+        width = np.abs(s_k - l_k)
+        max_risk = width - credit
+        max_risk = np.where(max_risk <= 0, 0.1, max_risk)
+        ror = credit / max_risk
+        # searchsorted 把 NaN 排到最高档；标量 bisect_left 给第 0 档，这里对齐成 0 分
+        ror_pts = np.asarray(_ROR_POINTS)[np.searchsorted(_ROR_BREAKS, ror, side="left")]
+        score = (
+            50
+            + np.where(hv > 50, 10, 0)
+            + np.where(np.isnan(ror), 0, ror_pts)
         )
 
+        cols = zip(hv.tolist(), credit.tolist(), width.tolist(), max_risk.tolist(), ror.tolist(), score.tolist())
+        for (i, legs), (h, c, w, mr, r, sc) in zip(live, cols):
+            rows[i] = self._build_row(ctxs[i], legs, h, c, w, mr, r, int(sc))
+        return rows
+
+    def _build_row(
+        self, ctx: Context, legs: tuple, hv_rank: float,
+        credit: float, width: float, max_risk: float, ror: float, score: int,
+        lite: bool = False,
+    ) -> ScanRow:
+        exp, side_short, side_long, s_strike, _, d_s, l_strike, _ = legs
+        strat_tag = "BULL-PUT" if side_short == "PUT" else "BEAR-CALL"
+        if score >= 70: strat_tag += "★"
+        
         calc_risk = max(0, 100 - score)
-        meta_data = ctx.tsf.copy() if ctx.tsf else {}
-        meta_data.update({"credit": credit, "width": width, "est_gamma": 0.0})
+        if lite:
+            meta_data = {}
+        else:
+            meta_data = {**(ctx.tsf or _EMPTY), "credit": credit, "width": width, "est_gamma": 0.0}
 
         # [FIX] 还原为 TSF 锚点
         tsf_short_exp = str(ctx.tsf.get("short_exp", "N/A"))
         tsf_short_dte = int(ctx.tsf.get("short_dte", 0))
         tsf_short_iv = float(ctx.tsf.get("short_iv", 0.0))
 
-        row = ScanRow(
-            symbol=ctx.symbol,
-            price=ctx.price,
-            short_exp=tsf_short_exp,
-            short_dte=tsf_short_dte,
-            short_iv=tsf_short_iv,
-            base_iv=ctx.tsf.get("month_iv", 0),
-            edge=ctx.tsf.get("edge_month", 0),
-            hv_rank=hv_rank,
-            regime=str(ctx.tsf.get("regime")),
-            curvature="NORMAL",
-            tag=strat_tag,
-            cal_score=int(score),
-            short_risk=int(calc_risk),
-            score_breakdown=ScoreBreakdown(base=50),
-            risk_breakdown=RiskBreakdown(base=0),
-            meta=meta_data 
+        bp = None
+        if not lite:
+            legs = [
+                OrderLeg(ctx.symbol, "SELL", 1, exp, s_strike, side_short),
+                OrderLeg(ctx.symbol, "BUY", 1, exp, l_strike, side_long)
+            ]
+            
+            bp = Blueprint(
+                symbol=ctx.symbol,
+                strategy=strat_tag.replace("★", ""),
+                legs=legs,
+                est_debit= -round(credit, 2),
+                note=f"Credit ${credit:.2f} | Risk ${max_risk:.2f} | RoR {ror:.1%}",
+                error=None,
+                short_greeks={"delta": d_s}
+            )
+
+        return ScanRow.from_tuple(
+            ctx.symbol, ctx.price,
+            tsf_short_exp, tsf_short_dte, tsf_short_iv,
+            ctx.tsf.get("month_iv", 0), ctx.tsf.get("edge_month", 0), hv_rank,
+            str(ctx.tsf.get("regime")), "NORMAL", strat_tag,
+            int(score), int(calc_risk),
+            ScoreBreakdown(base=50), RiskBreakdown(base=0),
+            meta_data, bp,
         )
-        row.blueprint = bp
-        return row
 
     def _empty_row(self, ctx, score, risk, note):
         from trade_guardian.domain.models import ScanRow, Blueprint, ScoreBreakdown, RiskBreakdown
         bp = Blueprint(ctx.symbol, "VERT-FAIL", [], 0.0, error=note, note=note)
-        meta_data = ctx.tsf.copy() if ctx.tsf else {}
-        meta_data["error"] = note
-        return ScanRow(
-            symbol=ctx.symbol, price=ctx.price,
-            short_exp="N/A", short_dte=0, short_iv=0, base_iv=0, edge=0, hv_rank=0,
-            regime="N/A", curvature="N/A", tag="VERT-FAIL",
-            cal_score=score, short_risk=risk,
-            score_breakdown=ScoreBreakdown(), risk_breakdown=RiskBreakdown(),
-            meta=meta_data, blueprint=bp
+        meta_data = {**(ctx.tsf or _EMPTY), "error": note}
+        return ScanRow.from_tuple(
+            ctx.symbol, ctx.price,
+            "N/A", 0, 0, 0, 0, 0,
+            "N/A", "N/A", "VERT-FAIL",
+            score, risk,
+            ScoreBreakdown(), RiskBreakdown(),
+            meta_data, bp,
         )
         
     def recommend(self, ctx: Context, min_score: int, max_risk: int) -> Tuple[Optional[Recommendation], str]:
-        row = self.evaluate(ctx)
+        row = self.evaluate(ctx, min_score=min_score)
         if row.blueprint and not row.blueprint.error and row.cal_score >= min_score:
              rec = Recommendation(
                 strategy="VERTICAL", symbol=ctx.symbol, action="OPEN",
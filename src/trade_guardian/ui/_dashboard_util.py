@@ -0,0 +1,230 @@
+"""
+Dashboard 的数据/格式化 helper：SQLite 读取与缓存、radar 组装、静态 HTML/CSS。
+dashboard.py 只保留页面布局与交互。
+"""
+
+import json
+import os
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from trade_guardian.app.persistence import PersistenceManager
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+
+# ==========================================
+# 静态 CSS / HTML 模板
+# ==========================================
+DASHBOARD_CSS = """
+<style>
+    /* Global Compact */
+    .block-container { padding-top: 0.5rem !important; padding-bottom: 1rem !important; }
+    
+    /* Compact Sidebar */
+    .sidebar-header {
+        display: flex; justify-content: space-between; align-items: center;
+        background-color: #262730; padding: 6px 4px; border-radius: 4px; border: 1px solid #444; margin-bottom: 10px;
+    }
+    .header-item { flex: 1; text-align: center; border-right: 1px solid #555; line-height: 1.1; }
+    .header-item:last-child { border-right: none; }
+    .header-label { font-size: 0.65rem; color: #aaa; text-transform: uppercase; margin-bottom: 1px; }
+    .header-value { font-size: 0.85rem; font-weight: 700; color: #eee; }
+
+    /* Compact Blueprint Box */
+    .blueprint-box {
+        font-size: 0.75rem; background-color: #1e1e1e; border: 1px solid #333;
+        border-radius: 3px; padding: 4px 8px; margin-bottom: 4px;
+        display: flex; justify-content: space-between;
+    }
+    .leg-buy { border-left: 3px solid #00c853; }
+    .leg-sell { border-left: 3px solid #f44336; }
+
+    /* Compact Calc Box */
+    .calc-box {
+        background-color: #0e1117; border: 1px solid #4caf50; border-radius: 6px;
+        padding: 8px; text-align: center; margin-top: 10px; margin-bottom: 10px;
+    }
+    .calc-title { color: #888; font-size: 0.7rem; margin-bottom: 2px; }
+    .calc-price { font-size: 1.8rem; font-weight: 700; color: #4caf50; font-family: 'Roboto Mono', monospace; line-height: 1; }
+    .calc-sub { font-size: 0.8rem; color: #aaa; margin-top: 2px; }
+
+    /* === Compact Trade Card Styles === */
+    .compact-card {
+        background-color: #161616; border: 1px solid #333; border-radius: 4px; 
+        margin-bottom: 8px; padding: 0; overflow: hidden;
+    }
+    
+    /* Status Strip */
+    .status-strip-working { border-left: 4px solid #ffeb3b; }
+    .status-strip-open { border-left: 4px solid #00c853; }
+    .status-strip-closed { border-left: 4px solid #9e9e9e; }
+
+    /* Header Row */
+    .card-header {
+        display: flex; justify-content: space-between; align-items: center;
+        padding: 6px 12px; background-color: #1e1e1e; border-bottom: 1px solid #2a2a2a;
+    }
+    .sym-box { display: flex; align-items: baseline; gap: 8px; }
+    .sym-text { font-size: 1rem; font-weight: 700; color: #eee; }
+    .strat-text { font-size: 0.75rem; color: #888; background: #2a2a2a; padding: 1px 5px; border-radius: 3px; }
+    .id-text { font-size: 0.7rem; color: #555; margin-left: 8px; }
+    
+    .metrics-box { display: flex; align-items: center; gap: 15px; }
+    .metric-item { text-align: right; line-height: 1.1; }
+    .metric-val { font-size: 0.95rem; font-weight: 700; color: #ddd; font-family: 'Roboto Mono', monospace; }
+    .metric-lbl { font-size: 0.65rem; color: #777; }
+    .pnl-pos { color: #00c853; }
+    .pnl-neg { color: #f44336; }
+    .t-pnl-neutral { color: #777; font-family: 'Roboto Mono', monospace; font-size: 0.95rem; }
+
+    .status-badge {
+        padding: 2px 8px; border-radius: 4px; font-weight: bold; font-size: 0.7rem; text-transform: uppercase;
+    }
+
+    /* Legs Section */
+    .legs-container { padding: 4px 12px; background-color: #161616; }
+    .leg-row {
+        display: flex; justify-content: flex-start; align-items: center;
+        padding: 2px 0; font-size: 0.8rem; font-family: 'Roboto Mono', monospace; color: #bbb;
+    }
+    .leg-icon { font-size: 0.6rem; margin-right: 6px; width: 12px; text-align: center; }
+    .leg-desc { flex: 1; }
+    .leg-price { width: 80px; text-align: right; color: #888; font-size: 0.75rem; }
+    .leg-pnl { width: 80px; text-align: right; font-weight: bold; font-size: 0.75rem; }
+
+    /* Action Bar */
+    .action-bar { padding: 4px 12px 8px 12px; }
+    
+</style>
+"""
+
+# Header 模板 (静态部分只定义一次，rerun 时只填值)
+VIX_TMPL = """
+<div style="background-color: #262730; padding: 8px 12px; border-radius: 5px; border-left: 5px solid {color};">
+    <div style="font-size: 0.75rem; color: #aaa; text-transform: uppercase;">Market VIX</div>
+    <div style="font-size: 2.0rem; font-weight: bold; color: white; line-height: 1;">{vix:.2f} <span style="font-size:0.9rem; color:{color}">({label})</span></div>
+</div>
+"""
+LAST_SCAN_TMPL = "<span style='font-size: 1.1rem; font-weight: bold;'>{time}</span>"
+
+
+# ==========================================
+# DB / Radar
+# ==========================================
+
+@st.cache_resource
+def get_db_manager():
+    return PersistenceManager() 
+
+DB_PATH = os.path.join(project_root, "db", "trade_guardian.db")
+
+# busy_timeout 放第一条，后面的 journal_mode=WAL 遇到扫描进程持锁时才会等待而不是立刻报错
+_DB_PRAGMAS = """
+PRAGMA busy_timeout=5000;
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA cache_size=-65536;
+PRAGMA mmap_size=268435456;
+PRAGMA temp_store=MEMORY;
+"""
+
+def _open_db(path):
+    """autocommit 连接 + 读多写少场景的 PRAGMA；dashboard 里所有直连 SQLite 都从这里开。"""
+    conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    conn.executescript(_DB_PRAGMAS)
+    return conn
+
+@st.cache_resource
+def get_db():
+    """
+    进程内共享的只读连接 (所有 session 共用)，省掉每次 cache miss 的 connect/schema 解析。
+    sqlite3 连接本身不是线程安全的，调用方需持有返回的锁 (RLock，允许同一线程嵌套取锁)。
+    WAL 让 scanner 写入时 dashboard 仍可读。
+    """
+    return _open_db(DB_PATH), threading.RLock()
+
+@st.cache_data(ttl=60)
+def load_blueprint(snapshot_id):
+    """blueprint_json 体积大，只在侧边栏选中某行时按 snapshot_id 单独取。"""
+    conn, lock = get_db()
+    with lock:
+        row = conn.execute("SELECT blueprint_json FROM trade_plans WHERE snapshot_id = ?", (snapshot_id,)).fetchone()
+    return row[0] if row else None
+
+@st.cache_resource(max_entries=256)
+def parse_bp(snapshot_id, _bp_json):
+    """
+    侧边栏每次 rerun (切 Pricing / 刷新) 都会重新解析同一份 blueprint。
+    用 cache_resource 而不是 cache_data：后者每次命中都要 pickle 拷贝，省不下 json.loads 的钱。
+    按 snapshot_id 缓存 (写入后不再变)，_bp_json 不参与哈希，命中时不用再扫一遍几 KB 的字符串。
+    返回的 dict 是共享对象，只读。
+    """
+    return json.loads(_bp_json)
+
+@st.cache_data(ttl=10)
+def load_radar_with_deltas():
+    if not os.path.exists(DB_PATH):
+        return None, None
+
+    get_db_manager()  # 确保 ts_unix 列/索引迁移已执行
+    conn, lock = get_db()
+    with lock:
+        # 最新批次 + 10m / 1h 前的批次，一条 SQL 在 ts_unix 上直接做减法
+        # (MAX() 而不是 ORDER BY batch_id DESC LIMIT 1：后者在 idx_sb_ts_unix 上还要 TEMP B-TREE 排序)
+        curr_batch = conn.execute(
+            """
+            SELECT b.batch_id, b.timestamp, b.market_vix,
+                   (SELECT MAX(o.batch_id) FROM scan_batches o WHERE o.ts_unix <= b.ts_unix - 600),
+                   (SELECT MAX(o.batch_id) FROM scan_batches o WHERE o.ts_unix <= b.ts_unix - 3600)
+            FROM scan_batches b
+            ORDER BY b.batch_id DESC LIMIT 1
+            """
+        ).fetchone()
+        if not curr_batch:
+            return None, None
+        curr_id, curr_ts, vix, id_10m, id_1h = curr_batch
+
+        query_main = """
+            SELECT
+                s.snapshot_id,
+                s.symbol, s.price, s.iv_short, s.edge, s.regime,
+                p.strategy_type, p.tag, p.cal_score, p.gate_status,
+                -- Δ = 当前价 - 历史批次价；历史批次没有该 symbol 时记 0 (走 idx_ms_batch_sym)
+                COALESCE(s.price - (SELECT o.price FROM market_snapshots o
+                                    WHERE o.batch_id = ? AND o.symbol = s.symbol LIMIT 1), 0.0) AS d_10m,
+                COALESCE(s.price - (SELECT o.price FROM market_snapshots o
+                                    WHERE o.batch_id = ? AND o.symbol = s.symbol LIMIT 1), 0.0) AS d_1h,
+                (p.cal_score + CASE p.gate_status
+                    WHEN 'EXEC'   THEN 120
+                    WHEN 'LIMIT'  THEN 40
+                    WHEN 'WAIT'   THEN -40
+                    WHEN 'FORBID' THEN -200
+                    ELSE -60
+                END) AS rank_score
+            FROM market_snapshots s
+            JOIN trade_plans p ON s.snapshot_id = p.snapshot_id
+            WHERE s.batch_id = ?
+            ORDER BY rank_score DESC, p.cal_score DESC
+        """
+        cur = conn.execute(query_main, (id_10m, id_1h, curr_id))
+        cols = [d[0] for d in cur.description]
+        rows = cur.fetchall()
+
+    df = pd.DataFrame.from_records(rows, columns=cols)
+
+    # 只用于展示/排序的数值列收窄 dtype；price / iv_short 会被 RECORD 写回 DB，保持 float64
+    for c in ("edge", "d_10m", "d_1h"):
+        df[c] = pd.to_numeric(df[c], errors="coerce", downcast="float")
+    for c in ("cal_score", "rank_score"):
+        df[c] = pd.to_numeric(df[c], errors="coerce", downcast="integer")
+    return df, (curr_ts, vix)
+
+def format_delta_vec(vals):
+    """整列格式化价格变化: 🟢 +x.xx / 🔴 -x.xx / ⚪ 0.00"""
+    vals = np.asarray(vals, dtype=np.float64)
+    prefix = np.where(vals > 0, "🟢 +", np.where(vals < 0, "🔴 ", "⚪ "))
+    return np.char.add(prefix, np.char.mod("%.2f", vals))
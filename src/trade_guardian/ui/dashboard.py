@@ -1,12 +1,11 @@
 import streamlit as st
-import pandas as pd
-import sqlite3
 import os
 import sys
-import json
+import re
 import time
 import textwrap
-from datetime import datetime, timedelta
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 
 # ==========================================
 # 1. 环境与路径设置
@@ -18,7 +17,10 @@ sys.path.insert(0, os.path.join(project_root, "src"))
 from trade_guardian.infra.config import load_config, DEFAULT_CONFIG
 from trade_guardian.infra.schwab_client import SchwabClient
 from trade_guardian.action.sniper import Sniper
-from trade_guardian.app.persistence import PersistenceManager
+from trade_guardian.ui._dashboard_util import (
+    DASHBOARD_CSS, VIX_TMPL, LAST_SCAN_TMPL,
+    get_db_manager, load_radar_with_deltas, load_blueprint, parse_bp, format_delta_vec,
+)
 
 # ==========================================
 # 2. 页面配置 & CSS (Compact Mode)
@@ -33,91 +35,7 @@ st.set_page_config(
 if "last_refresh_time" not in st.session_state:
     st.session_state.last_refresh_time = time.time()
 
-st.markdown(
-    """
-<style>
-    /* Global Compact */
-    .block-container { padding-top: 0.5rem !important; padding-bottom: 1rem !important; }
-    
-    /* Compact Sidebar */
-    .sidebar-header {
-        display: flex; justify-content: space-between; align-items: center;
-        background-color: #262730; padding: 6px 4px; border-radius: 4px; border: 1px solid #444; margin-bottom: 10px;
-    }
-    .header-item { flex: 1; text-align: center; border-right: 1px solid #555; line-height: 1.1; }
-    .header-item:last-child { border-right: none; }
-    .header-label { font-size: 0.65rem; color: #aaa; text-transform: uppercase; margin-bottom: 1px; }
-    .header-value { font-size: 0.85rem; font-weight: 700; color: #eee; }
-
-    /* Compact Blueprint Box */
-    .blueprint-box {
-        font-size: 0.75rem; background-color: #1e1e1e; border: 1px solid #333;
-        border-radius: 3px; padding: 4px 8px; margin-bottom: 4px;
-        display: flex; justify-content: space-between;
-    }
-    .leg-buy { border-left: 3px solid #00c853; }
-    .leg-sell { border-left: 3px solid #f44336; }
-
-    /* Compact Calc Box */
-    .calc-box {
-        background-color: #0e1117; border: 1px solid #4caf50; border-radius: 6px;
-        padding: 8px; text-align: center; margin-top: 10px; margin-bottom: 10px;
-    }
-    .calc-title { color: #888; font-size: 0.7rem; margin-bottom: 2px; }
-    .calc-price { font-size: 1.8rem; font-weight: 700; color: #4caf50; font-family: 'Roboto Mono', monospace; line-height: 1; }
-    .calc-sub { font-size: 0.8rem; color: #aaa; margin-top: 2px; }
-
-    /* === Compact Trade Card Styles === */
-    .compact-card {
-        background-color: #161616; border: 1px solid #333; border-radius: 4px; 
-        margin-bottom: 8px; padding: 0; overflow: hidden;
-    }
-    
-    /* Status Strip */
-    .status-strip-working { border-left: 4px solid #ffeb3b; }
-    .status-strip-open { border-left: 4px solid #00c853; }
-    .status-strip-closed { border-left: 4px solid #9e9e9e; }
-
-    /* Header Row */
-    .card-header {
-        display: flex; justify-content: space-between; align-items: center;
-        padding: 6px 12px; background-color: #1e1e1e; border-bottom: 1px solid #2a2a2a;
-    }
-    .sym-box { display: flex; align-items: baseline; gap: 8px; }
-    .sym-text { font-size: 1rem; font-weight: 700; color: #eee; }
-    .strat-text { font-size: 0.75rem; color: #888; background: #2a2a2a; padding: 1px 5px; border-radius: 3px; }
-    .id-text { font-size: 0.7rem; color: #555; margin-left: 8px; }
-    
-    .metrics-box { display: flex; align-items: center; gap: 15px; }
-    .metric-item { text-align: right; line-height: 1.1; }
-    .metric-val { font-size: 0.95rem; font-weight: 700; color: #ddd; font-family: 'Roboto Mono', monospace; }
-    .metric-lbl { font-size: 0.65rem; color: #777; }
-    .pnl-pos { color: #00c853; }
-    .pnl-neg { color: #f44336; }
-    .t-pnl-neutral { color: #777; font-family: 'Roboto Mono', monospace; font-size: 0.95rem; }
-
-    .status-badge {
-        padding: 2px 8px; border-radius: 4px; font-weight: bold; font-size: 0.7rem; text-transform: uppercase;
-    }
-
-    /* Legs Section */
-    .legs-container { padding: 4px 12px; background-color: #161616; }
-    .leg-row {
-        display: flex; justify-content: flex-start; align-items: center;
-        padding: 2px 0; font-size: 0.8rem; font-family: 'Roboto Mono', monospace; color: #bbb;
-    }
-    .leg-icon { font-size: 0.6rem; margin-right: 6px; width: 12px; text-align: center; }
-    .leg-desc { flex: 1; }
-    .leg-price { width: 80px; text-align: right; color: #888; font-size: 0.75rem; }
-    .leg-pnl { width: 80px; text-align: right; font-weight: bold; font-size: 0.75rem; }
-
-    /* Action Bar */
-    .action-bar { padding: 4px 12px 8px 12px; }
-    
-</style>
-""",
-    unsafe_allow_html=True
-)
+st.markdown(DASHBOARD_CSS, unsafe_allow_html=True)
 
 # ==========================================
 # 3. 辅助函数
@@ -140,154 +58,147 @@ def get_sniper():
     cfg = load_config(cfg_path, DEFAULT_CONFIG)
     return Sniper(SchwabClient(cfg))
 
-@st.cache_resource
-def get_db_manager():
-    return PersistenceManager() 
-
-def get_past_batch_id(conn, current_ts_str, minutes_ago):
-    try:
-        curr_dt = datetime.strptime(current_ts_str, "%Y-%m-%d %H:%M:%S")
-        target_dt = curr_dt - timedelta(minutes=minutes_ago)
-        target_str = target_dt.strftime("%Y-%m-%d %H:%M:%S")
-        row = conn.execute(
-            "SELECT batch_id, timestamp FROM scan_batches WHERE timestamp <= ? ORDER BY batch_id DESC LIMIT 1",
-            (target_str,)
-        ).fetchone()
-        return row[0] if row else None
-    except Exception:
-        return None
-
-@st.cache_data(ttl=10)
-def load_radar_with_deltas():
-    db_path = os.path.join(project_root, "db", "trade_guardian.db")
-    if not os.path.exists(db_path):
-        return None, None
-
-    conn = sqlite3.connect(db_path)
-    try:
-        curr_batch = conn.execute(
-            "SELECT batch_id, timestamp, market_vix FROM scan_batches ORDER BY batch_id DESC LIMIT 1"
-        ).fetchone()
-        if not curr_batch:
-            return None, None
-        curr_id, curr_ts, vix = curr_batch
-
-        id_10m = get_past_batch_id(conn, curr_ts, 10)
-        id_1h = get_past_batch_id(conn, curr_ts, 60)
-
-        query_main = """
-            SELECT
-                s.snapshot_id,
-                s.symbol, s.price, s.iv_short, s.edge, s.regime,
-                p.strategy_type, p.tag, p.cal_score, p.gate_status, p.blueprint_json,
-                (p.cal_score + CASE p.gate_status
-                    WHEN 'EXEC'   THEN 120
-                    WHEN 'LIMIT'  THEN 40
-                    WHEN 'WAIT'   THEN -40
-                    WHEN 'FORBID' THEN -200
-                    ELSE -60
-                END) AS rank_score
-            FROM market_snapshots s
-            JOIN trade_plans p ON s.snapshot_id = p.snapshot_id
-            WHERE s.batch_id = ?
-            ORDER BY rank_score DESC, p.cal_score DESC
-        """
-        df = pd.read_sql_query(query_main, conn, params=(curr_id,))
-
-        df["d_10m"] = 0.0
-        df["d_1h"] = 0.0
-
-        if id_10m:
-            df_10 = pd.read_sql_query("SELECT symbol, price FROM market_snapshots WHERE batch_id = ?", conn, params=(id_10m,))
-            merged = df.merge(df_10, on="symbol", how="left", suffixes=("", "_old"))
-            df["d_10m"] = merged["price"] - merged["price_old"]
-
-        if id_1h:
-            df_1h = pd.read_sql_query("SELECT symbol, price FROM market_snapshots WHERE batch_id = ?", conn, params=(id_1h,))
-            merged = df.merge(df_1h, on="symbol", how="left", suffixes=("", "_old"))
-            df["d_1h"] = merged["price"] - merged["price_old"]
-
-        df["d_10m"] = pd.to_numeric(df["d_10m"], errors='coerce').fillna(0.0)
-        df["d_1h"] = pd.to_numeric(df["d_1h"], errors='coerce').fillna(0.0)
-
-        return df, (curr_ts, vix)
-    finally:
-        conn.close()
+# 子串关键字匹配 (与原 any(k in s ...) 等价)，模块级预编译
+_CREDIT_RE = re.compile(r"BULL-PUT|BEAR-CALL|CREDIT|IC|IRON|CONDOR|VERTICAL")
+_MULTI_LEG_RE = re.compile(r"DIAGONAL|PMCC|BULL|BEAR|VERT|PCS|CCS|IC|IRON|CONDOR")
+# Radar 选中行时侧栏需要的字段 (snapshot_id 是 numpy.int64，sqlite3 绑定前仍需 int())
+_SIDEBAR_COLS = ("snapshot_id", "symbol", "strategy_type", "tag", "gate_status", "price", "iv_short")
+
+@st.cache_data(ttl=15, show_spinner=False)
+def _cached_chain(_sniper, symbol, exp):
+    """单到期日期权链 15s 内复用：切 tab / 点按钮引起的 rerun 不再重复请求。"""
+    return _sniper._fetch_chain_one_exp(symbol, exp)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_lock(_sniper, symbol, strategy, short_exp, short_strike, long_exp, long_strike, urgency):
+    """侧栏定价结果按 (标的, 腿, urgency) 缓存 30s：重复点同一行 / 来回切 urgency 不再重复打 Schwab。"""
+    return _sniper.lock_target(symbol, strategy, short_exp, short_strike, long_exp, long_strike, urgency)
+
+def _short_ts(ts):
+    """"YYYY-MM-DD HH:MM:SS" -> "MM/DD HH:MM"；格式固定 (PersistenceManager 写入)，直接切片。其他格式原样返回。"""
+    if isinstance(ts, str) and len(ts) == 19 and ts[4] == "-" and ts[7] == "-" and ts[10] == " ":
+        return f"{ts[5:7]}/{ts[8:10]} {ts[11:16]}"
+    return ts
+
+def _prefetch_chains(trades, sniper_client, max_workers=8):
+    """
+    所有交易/腿里去重后的 (symbol, exp) 并发拉一次期权链，同一到期日的腿共用结果。
+    单个请求失败时存异常对象，由使用它的交易自己抛出 (只影响那一笔，同原逻辑)。
+    多线程共用同一个 sniper_client 是安全的：Sniper / SchwabClient 构造后无可变状态，
+    每个请求 (含取 token) 都是独立的 requests.get，没有共享 Session。给 client 加状态前先改这里。
+    """
+    needed = list(dict.fromkeys(
+        (t.get('symbol'), leg.get('exp_date')) for t in trades for leg in (t.get('legs') or [])
+    ))
+    if not needed:
+        return {}
+
+    chain_map = {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(needed))) as ex:
+        futures = {k: ex.submit(_cached_chain, sniper_client, *k) for k in needed}
+        for k, fut in futures.items():
+            try:
+                chain_map[k] = fut.result()
+            except Exception as e:
+                chain_map[k] = e
+    return chain_map
 
 def calculate_live_pnl(trades, sniper_client):
     if not trades or not sniper_client:
         return trades or []
     enhanced_trades = []
-    CREDIT_KEYWORDS = ["BULL-PUT", "BEAR-CALL", "CREDIT", "IC", "IRON", "CONDOR", "VERTICAL"]
-    
+
+    chain_map = _prefetch_chains(trades, sniper_client)
+
+    # Pass 1: 逐腿取报价 (dict 查找只能在 Python 里做)，数值摊平成并行数组
+    # pending: (t_enhanced, status_str, is_credit, leg 元组列表)；每条腿 = (原 leg, 数组下标 或 None)
+    pending = []
+    bids, asks, marks, side_mults, entry_pxs, is_buys, leg_tidx = [], [], [], [], [], [], []
     for t in trades:
-        t_enhanced = dict(t)
         status_str = str(t.get('status', '')).strip().upper()
+        # 只有 OPEN / WORKING 需要实时报价 (WORKING 的 Fill 要用腿的 live_price)，其余原样透传，不复制
+        if status_str not in ('OPEN', 'WORKING'):
+            enhanced_trades.append(t)
+            continue
+        t_enhanced = t.copy()
+        enhanced_trades.append(t_enhanced)
         
         try:
-            legs = t.get('legs', [])
             strat_type = str(t.get('strategy', '')).upper()
             tags = str(t.get('tags', '')).upper()
-            is_credit = any(k in strat_type or k in tags for k in CREDIT_KEYWORDS)
-            current_strategy_value = 0.0
-            all_legs_valid = True
-            live_legs = []
+            is_credit = bool(_CREDIT_RE.search(strat_type) or _CREDIT_RE.search(tags))
+            slot = len(pending)
+            leg_refs = []
+            n0 = len(bids)
             
             # 无论什么状态，都先获取实时报价 (Crucial for Fill action)
-            for leg in legs:
-                l_copy = dict(leg)
-                exp = l_copy.get('exp_date')
-                strike = float(l_copy.get('strike'))
-                op_type = l_copy.get('op_type') 
-                action = l_copy.get('action')   
+            for leg in t.get('legs', []):
+                exp = leg.get('exp_date')
+                strike = leg.get('strike')
+                op_type = leg.get('op_type') 
                 
-                # 1. Prepare Entry Price
-                try:
-                    raw_ep = l_copy.get('entry_price', 0.0)
-                    if raw_ep is None: raw_ep = 0.0
-                    entry_px = float(raw_ep)
-                except: entry_px = 0.0
-                
-                # 2. Fetch Live Price
-                leg_price = 0.0
-                chain_data = sniper_client._fetch_chain_one_exp(t['symbol'], exp)
+                chain_data = chain_map.get((t['symbol'], exp))
+                if isinstance(chain_data, Exception): raise chain_data
                 side_key = "callExpDateMap" if op_type.upper() == "CALL" else "putExpDateMap"
                 q_data = sniper_client._extract_quote(chain_data, side_key, exp, strike)
                 
-                if q_data:
-                    bid = float(q_data.get('bid', 0))
-                    ask = float(q_data.get('ask', 0))
-                    mark = float(q_data.get('mark', 0))
-                    if mark > 0: leg_price = mark
-                    elif bid > 0 and ask > 0: leg_price = (bid + ask) / 2.0
-                    else: leg_price = 0.0
-                else:
-                    all_legs_valid = False
+                if not q_data:
+                    # 没有报价：总 PnL 作废，这条腿原样挂上 (不复制，界面显示 "--")
+                    leg_refs.append((leg, None))
+                    continue
                 
-                # 3. Add to Strategy Value
-                side_mult = 1 if str(action).upper() == 'BUY' else -1
-                current_strategy_value += (leg_price * side_mult)
+                entry_px = (leg.get('entry_price') or 0.0) if status_str == 'OPEN' else 0.0
                 
-                # 4. Calculate PnL (ONLY if OPEN and entry_px valid)
-                l_copy['leg_pnl'] = None
-                if status_str == 'OPEN':
-                    if entry_px > 0.001:
-                        # Logic: Current Price - Entry Price (for Display)
-                        if str(action).upper() == 'BUY': 
-                            l_pnl = leg_price - entry_px
-                        else: 
-                            l_pnl = entry_px - leg_price
-                        l_copy['leg_pnl'] = l_pnl
-
-                l_copy['live_price'] = leg_price
-                live_legs.append(l_copy)
-            
-            t_enhanced['legs'] = live_legs
-            
+                is_buy = str(leg.get('action')).upper() == 'BUY'
+                leg_refs.append((leg, len(bids) - n0))
+                bids.append(float(q_data.get('bid', 0)))
+                asks.append(float(q_data.get('ask', 0)))
+                marks.append(float(q_data.get('mark', 0)))
+                side_mults.append(1.0 if is_buy else -1.0)
+                entry_pxs.append(entry_px)
+                is_buys.append(is_buy)
+                leg_tidx.append(slot)
+        except Exception as e: 
+            # 本笔作废：回滚已压入的腿，保持数组与 pending 对齐
+            for arr in (bids, asks, marks, side_mults, entry_pxs, is_buys, leg_tidx):
+                del arr[n0:]
+            t_enhanced['live_pnl'] = None
+            continue
+        pending.append((t_enhanced, status_str, is_credit, leg_refs, n0))
+
+    if not pending:
+        return enhanced_trades
+
+    # Pass 2: 价格 / 腿 PnL / 每笔策略价值 一次向量化算完
+    bid_a = np.asarray(bids, dtype=np.float64)
+    ask_a = np.asarray(asks, dtype=np.float64)
+    mark_a = np.asarray(marks, dtype=np.float64)
+    entry_a = np.asarray(entry_pxs, dtype=np.float64)
+    mult_a = np.asarray(side_mults, dtype=np.float64)
+    leg_px = np.where(mark_a > 0, mark_a, np.where((bid_a > 0) & (ask_a > 0), (bid_a + ask_a) / 2.0, 0.0))
+    leg_pnl = np.where(np.asarray(is_buys, dtype=bool), leg_px - entry_a, entry_a - leg_px)
+    has_pnl = entry_a > 0.001
+    strat_val = np.bincount(np.asarray(leg_tidx, dtype=np.intp), weights=leg_px * mult_a, minlength=len(pending))
+    leg_px_l, leg_pnl_l, has_pnl_l = leg_px.tolist(), leg_pnl.tolist(), has_pnl.tolist()
+
+    # Pass 3: 结果写回。fetch_active_trades 每次都返回新建的 dict，腿直接原地写 live_price / leg_pnl，不再逐条复制
+    for slot, (t_enhanced, status_str, is_credit, leg_refs, n0) in enumerate(pending):
+        all_legs_valid = True
+        for leg, k in leg_refs:
+            if k is None:
+                all_legs_valid = False
+                continue
+            i = n0 + k
+            # 4. Calculate PnL (ONLY if OPEN and entry_px valid)
+            leg['leg_pnl'] = leg_pnl_l[i] if (status_str == 'OPEN' and has_pnl_l[i]) else None
+            leg['live_price'] = leg_px_l[i]
+        current_strategy_value = float(strat_val[slot])
+        
+        try:
             # 5. Calculate Total PnL (Only if OPEN and all legs valid)
             if status_str == 'OPEN' and all_legs_valid:
-                fill_price = float(t.get('initial_cost') or 0.0)
-                qty = int(t.get('quantity') or 1)
+                fill_price = t_enhanced.get('initial_cost') or 0.0
+                qty = t_enhanced.get('quantity') or 1
                 
                 if is_credit:
                     pnl_total = (fill_price + current_strategy_value) * 100 * qty
@@ -304,8 +215,7 @@ def calculate_live_pnl(trades, sniper_client):
         
         except Exception as e: 
             t_enhanced['live_pnl'] = None
-        
-        enhanced_trades.append(t_enhanced)
+    
     return enhanced_trades
 
 
@@ -315,45 +225,36 @@ def calculate_live_pnl(trades, sniper_client):
 
 st.title("🛡️ Trade Guardian Command Center")
 
-# Header VIX Display
-db_path = os.path.join(project_root, "db", "trade_guardian.db")
-if os.path.exists(db_path):
-    conn = sqlite3.connect(db_path)
-    curr_batch = conn.execute("SELECT timestamp, market_vix FROM scan_batches ORDER BY batch_id DESC LIMIT 1").fetchone()
-    conn.close()
+# Header VIX Display (复用 radar 的缓存结果：不再单独查库，VIX 与表格同一批次)
+df, metadata = load_radar_with_deltas()
+if metadata:
+    ts, vix = metadata
+    vix_val = vix
+    vix_label = "NORMAL"
+    vix_color = "#ffd700"
+    if vix_val < 15:
+        vix_color = "#00c853"; vix_label = "LOW"
+    elif 20 <= vix_val < 25:
+        vix_color = "#ff9800"; vix_label = "ELEVATED"
+    elif vix_val >= 25:
+        vix_color = "#f44336"; vix_label = "PANIC"
+
+    c1, c2, c3, c4 = st.columns([1.5, 1, 1, 1])
     
-    if curr_batch:
-        ts, vix = curr_batch
-        vix_val = float(vix)
-        vix_label = "NORMAL"
-        vix_color = "#ffd700"
-        if vix_val < 15:
-            vix_color = "#00c853"; vix_label = "LOW"
-        elif 20 <= vix_val < 25:
-            vix_color = "#ff9800"; vix_label = "ELEVATED"
-        elif vix_val >= 25:
-            vix_color = "#f44336"; vix_label = "PANIC"
-
-        c1, c2, c3, c4 = st.columns([1.5, 1, 1, 1])
+    with c1:
+        st.markdown(VIX_TMPL.format(color=vix_color, vix=vix_val, label=vix_label), unsafe_allow_html=True)
         
-        with c1:
-            st.markdown(f"""
-                <div style="background-color: #262730; padding: 8px 12px; border-radius: 5px; border-left: 5px solid {vix_color};">
-                    <div style="font-size: 0.75rem; color: #aaa; text-transform: uppercase;">Market VIX</div>
-                    <div style="font-size: 2.0rem; font-weight: bold; color: white; line-height: 1;">{vix:.2f} <span style="font-size:0.9rem; color:{vix_color}">({vix_label})</span></div>
-                </div>
-            """, unsafe_allow_html=True)
-            
-        with c2:
-            st.caption("Last Scan")
-            st.markdown(f"<span style='font-size: 1.1rem; font-weight: bold;'>{ts.split(' ')[1]}</span>", unsafe_allow_html=True)
+    with c2:
+        st.caption("Last Scan")
+        st.markdown(LAST_SCAN_TMPL.format(time=ts.split(' ')[1]), unsafe_allow_html=True)
 
-        with c4:
-            if st.button("🔄"):
-                load_radar_with_deltas.clear()
-                st.rerun()
+    with c4:
+        if st.button("🔄"):
+            load_radar_with_deltas.clear()
+            st.rerun()
 
-tab_scanner, tab_manager = st.tabs(["📡 Scanner", "💼 Active Trades"])
+# on_change="rerun" 让 tab 的 .open 可用，未选中的 tab 可以跳过昂贵的部分
+tab_scanner, tab_manager = st.tabs(["📡 Scanner", "💼 Active Trades"], key="main_tabs", on_change="rerun")
 
 # ==========================================
 # TAB 1: Scanner
@@ -362,24 +263,18 @@ with tab_scanner:
     if "auto_refresh" not in st.session_state:
         st.session_state.auto_refresh = True
 
-    df, metadata = load_radar_with_deltas()
-    
     if df is not None:
-        display_df = df.copy()
-        
-        def format_delta(val):
-            if val > 0: return f"🟢 +{val:.2f}"
-            elif val < 0: return f"🔴 {val:.2f}"
-            else: return f"⚪ {val:.2f}"
-
-        display_df["Δ10m"] = display_df["d_10m"].apply(format_delta)
-        display_df["Δ1h"] = display_df["d_1h"].apply(format_delta)
-
-        cols = ["symbol", "price", "Δ10m", "Δ1h", "iv_short", "edge", "regime", "strategy_type", "tag", "gate_status", "cal_score", "blueprint_json"]
+        # 只取展示列再 assign，不整表 copy
+        deltas = {
+            "Δ10m": format_delta_vec(df["d_10m"].to_numpy()),
+            "Δ1h": format_delta_vec(df["d_1h"].to_numpy()),
+        }
+        cols = ["symbol", "price", "Δ10m", "Δ1h", "iv_short", "edge", "regime", "strategy_type", "tag", "gate_status", "cal_score"]
+        base_cols = [c for c in cols if c in df.columns]
+        display_df = df[base_cols].assign(**deltas)
         display_df = display_df[[c for c in cols if c in display_df.columns]]
 
         column_cfg = {
-            "blueprint_json": None,
             "cal_score": st.column_config.ProgressColumn("Score", min_value=0, max_value=100, format="%d"),
             "symbol": st.column_config.TextColumn("Sym", width="small"),
             "price": st.column_config.NumberColumn("Px", format="$%.2f"),
@@ -394,10 +289,11 @@ with tab_scanner:
 
         if len(event.selection.rows) > 0:
             selected_index = event.selection.rows[0]
-            row = df.iloc[selected_index]
+            # 只取侧栏用到的几个字段，按列 .iat 取标量，不为选中行构造整行 Series
+            row = {c: df[c].iat[selected_index] for c in _SIDEBAR_COLS if c in df.columns}
             symbol = row["symbol"]
-            bp_json_raw = row["blueprint_json"]
             snapshot_id = int(row.get("snapshot_id", 0))
+            bp_json_raw = load_blueprint(snapshot_id)
 
             with st.sidebar:
                 st.markdown(f"#### 🔭 {symbol}")
@@ -416,14 +312,13 @@ with tab_scanner:
 
                 if bp_json_raw:
                     try:
-                        bp_data = json.loads(bp_json_raw)
+                        bp_data = parse_bp(snapshot_id, bp_json_raw)
                         legs = bp_data.get("legs", [])
                         if legs:
                             bp_valid = True
                             strat_name = str(row["strategy_type"]).upper()
                             tag_name = str(row["tag"]).upper()
-                            multi_leg_kws = ["DIAGONAL", "PMCC", "BULL", "BEAR", "VERT", "PCS", "CCS", "IC", "IRON", "CONDOR"]
-                            is_multi_leg = any(k in strat_name or k in tag_name for k in multi_leg_kws)
+                            is_multi_leg = bool(_MULTI_LEG_RE.search(strat_name) or _MULTI_LEG_RE.search(tag_name))
 
                             if is_multi_leg:
                                 target_strategy = row["strategy_type"]
@@ -450,7 +345,8 @@ with tab_scanner:
                     try:
                         sniper = get_sniper()
                         if sniper:
-                            res = sniper.lock_target(symbol, target_strategy, short_exp, short_strike, long_exp, long_strike, urgency)
+                            # 只为选中的 urgency 定价；切到其他档位时按需取，之后由 _cached_lock 命中
+                            res = _cached_lock(sniper, symbol, target_strategy, short_exp, short_strike, long_exp, long_strike, urgency)
                             if res.get("status") == "READY":
                                 is_ready = True
                                 limit_price_val = res['limit_price']
@@ -466,7 +362,7 @@ with tab_scanner:
                     trade_id = db.record_order(
                         snapshot_id=snapshot_id, symbol=symbol, strategy=target_strategy,
                         limit_price=limit_price_val, quantity=1, blueprint_json=bp_json_raw,
-                        tags=row['tag'], underlying_price=float(row['price']), iv=float(row['iv_short'])
+                        tags=row['tag'], underlying_price=row['price'], iv=row['iv_short']
                     )
                     if trade_id: st.toast(f"Recorded! ID: {trade_id}", icon="💾"); time.sleep(1); st.rerun()
         else:
@@ -480,9 +376,103 @@ with tab_scanner:
 # ==========================================
 # TAB 2: Active Trades (COMPACT MODE)
 # ==========================================
+@st.fragment
+def _render_trade_card(t, db):
+    """
+    单张交易卡片。作为 fragment：在卡片里输入 Fill Px / 展开详情只重跑这张卡，
+    不会触发整页重跑去重新算所有交易的 live PnL。改库的按钮仍用 st.rerun() 刷新整页。
+    """
+    t_id = t["trade_id"]
+    sym = t["symbol"]
+    strat = t["strategy"]
+    status = t["status"]
+    limit = t.get("initial_cost") or 0.0
+    created = t["created_at"]
+    
+    created_display = _short_ts(created)
+
+    # Prepare PnL HTML string
+    if status == "OPEN":
+        pnl = t.get('live_pnl', 0.0)
+        pct = t.get('live_pnl_pct', 0.0)
+        cls = "t-pnl-pos" if pnl >= 0 else "t-pnl-neg"
+        pnl_html = f"<span class='{cls}'>${pnl:.0f} ({pct:.1f}%)</span>"
+    else:
+        pnl_html = "<span class='t-pnl-neutral'>--</span>"
+
+    status_border = "border-working" if status=="WORKING" else "border-open"
+    status_badge_cls = "st-working" if status=="WORKING" else "st-open"
+
+    # 1. Compact Header Row (HTML)
+    header_html = f"""
+    <div class="trade-row {status_border}">
+        <div>
+            <span class="t-sym">{sym}</span>
+            <span class="t-strat">{strat}</span>
+            <span class="t-meta">#{t_id} {created_display}</span>
+        </div>
+        <div class="t-right">
+            {pnl_html}
+            <span class="t-price">${limit:.2f}</span>
+            <span class="t-status {status_badge_cls}">{status}</span>
+        </div>
+    </div>
+    """
+    st.markdown(textwrap.dedent(header_html), unsafe_allow_html=True)
+    
+    # 2. Hidden Details (Expander)
+    with st.expander("Manage / Details"):
+        # Legs Table: 所有腿拼成一段 HTML，一次 st.markdown (原先每条腿 st.columns(4) + 3 次写入)
+        legs_list = t.get('legs', [])
+        if legs_list:
+            rows = []
+            for leg in legs_list:
+                act = str(leg.get('action', '')).upper()
+                live_px = leg.get('live_price')
+                leg_pnl = leg.get('leg_pnl')
+                icon = "🟢" if act == "BUY" else "🔴"
+                px_html = f"Mkt ${live_px:.2f}" if live_px is not None else ""
+                # [FIXED] PnL Display Logic
+                if leg_pnl is not None:
+                    p_color = "#00c853" if leg_pnl >= 0 else "#f44336"
+                    pnl_html = f"<span style='color:{p_color}'>${leg_pnl:.2f}</span>"
+                else:
+                    pnl_html = "<span style='color:#555'>--</span>"
+                rows.append(
+                    f"<div class='leg-row'><span class='leg-icon'>{icon}</span>"
+                    f"<span class='leg-desc'><b>{act} {leg.get('ratio')}x</b> {leg.get('exp_date')} "
+                    f"<b>{leg.get('strike')} {leg.get('op_type')}</b></span>"
+                    f"<span class='leg-price'>{px_html}</span><span class='leg-pnl'>{pnl_html}</span></div>"
+                )
+            st.markdown(f"<div class='legs-container'>{''.join(rows)}</div>", unsafe_allow_html=True)
+        
+        # Buttons (只有 WORKING / OPEN 才建列和按钮)
+        if status == "WORKING":
+            c_act1, c_act2, c_act3, c_act4 = st.columns([1, 1, 3, 1])
+            with c_act1:
+                fill_px = st.number_input("Fill Px", value=limit, key=f"f_{t_id}", label_visibility="collapsed")
+            with c_act2:
+                if st.button("Fill", key=f"b_fill_{t_id}"):
+                    db.update_trade_status(t_id, "OPEN", fill_px)
+                    # [IMPORTANT] Update leg entry prices with the live prices captured in t['legs']
+                    if 'legs' in t: db.update_leg_entry_prices(t_id, t['legs'])
+                    st.rerun()
+            with c_act4:
+                if st.button("Cancel", key=f"b_can_{t_id}"):
+                    db.update_trade_status(t_id, "CLOSED"); st.rerun()
+        elif status == "OPEN":
+            c_act4 = st.columns([1, 1, 3, 1])[3]
+            with c_act4:
+                if st.button("Close", key=f"b_cls_{t_id}"):
+                    db.update_trade_status(t_id, "CLOSED"); st.rerun()
+    
+    # Tiny spacer between cards
+    st.markdown("<div style='margin-bottom: 8px;'></div>", unsafe_allow_html=True)
+
 with tab_manager:
     db = get_db_manager()
-    trades = db.fetch_active_trades()
+    # 停留在 Scanner 时不查交易、不拉 Schwab 报价
+    trades = db.fetch_active_trades() if tab_manager.open else []
     
     if not trades:
         st.caption("No active trades.")
@@ -491,9 +481,12 @@ with tab_manager:
         enhanced_trades = calculate_live_pnl(trades, sniper_instance)
         
         # [MODIFIED] Top Stats Row (Compact & Right-aligned PnL)
-        open_c = sum(1 for t in enhanced_trades if t['status']=='OPEN')
-        work_c = sum(1 for t in enhanced_trades if t['status']=='WORKING')
-        tot_pnl = sum(t.get('live_pnl', 0.0) or 0.0 for t in enhanced_trades)
+        open_c = work_c = 0
+        tot_pnl = 0.0
+        for t in enhanced_trades:
+            if t['status'] == 'OPEN': open_c += 1
+            elif t['status'] == 'WORKING': work_c += 1
+            tot_pnl += t.get('live_pnl', 0.0) or 0.0
         
         c1, c2, c3, c4 = st.columns([0.8, 0.8, 2, 2])
         
@@ -513,102 +506,34 @@ with tab_manager:
                     <span style='font-size:0.85rem; color:{p_color}; background:#1e1e1e; padding:1px 4px; border-radius:3px'>{p_delta}</span>
                 </div>
             """, unsafe_allow_html=True)
+
+        with c4:
+            if st.button("🔄 Quotes", key="refresh_quotes"):
+                _cached_chain.clear()
+                _cached_lock.clear()
+                st.rerun()
         
         st.markdown("---")
 
         # Compact Rows
         for t in enhanced_trades:
-            t_id = t["trade_id"]
-            sym = t["symbol"]
-            strat = t["strategy"]
-            status = t["status"]
-            limit = float(t.get("initial_cost", 0.0))
-            created = t["created_at"]
-            
-            try:
-                dt_obj = datetime.strptime(created, "%Y-%m-%d %H:%M:%S")
-                created_display = dt_obj.strftime("%m/%d %H:%M")
-            except: created_display = created
-
-            # Prepare PnL HTML string
-            if status == "OPEN":
-                pnl = t.get('live_pnl', 0.0)
-                pct = t.get('live_pnl_pct', 0.0)
-                cls = "t-pnl-pos" if pnl >= 0 else "t-pnl-neg"
-                pnl_html = f"<span class='{cls}'>${pnl:.0f} ({pct:.1f}%)</span>"
-            else:
-                pnl_html = "<span class='t-pnl-neutral'>--</span>"
-
-            status_border = "border-working" if status=="WORKING" else "border-open"
-            status_badge_cls = "st-working" if status=="WORKING" else "st-open"
-
-            # 1. Compact Header Row (HTML)
-            header_html = f"""
-            <div class="trade-row {status_border}">
-                <div>
-                    <span class="t-sym">{sym}</span>
-                    <span class="t-strat">{strat}</span>
-                    <span class="t-meta">#{t_id} {created_display}</span>
-                </div>
-                <div class="t-right">
-                    {pnl_html}
-                    <span class="t-price">${limit:.2f}</span>
-                    <span class="t-status {status_badge_cls}">{status}</span>
-                </div>
-            </div>
-            """
-            st.markdown(textwrap.dedent(header_html), unsafe_allow_html=True)
-            
-            # 2. Hidden Details (Expander)
-            with st.expander("Manage / Details"):
-                # Legs Table
-                legs_list = t.get('legs', [])
-                if legs_list:
-                    for leg in legs_list:
-                        act = str(leg.get('action', '')).upper()
-                        ratio = leg.get('ratio')
-                        exp = leg.get('exp_date')
-                        strike = leg.get('strike')
-                        op_type = leg.get('op_type')
-                        live_px = leg.get('live_price')
-                        leg_pnl = leg.get('leg_pnl')
-                        
-                        icon = "🟢" if act == "BUY" else "🔴"
-                        c_a, c_b, c_c, c_d = st.columns([0.5, 5, 2, 2])
-                        c_a.write(icon)
-                        c_b.caption(f"**{act} {ratio}x** {exp} **{strike} {op_type}**")
-                        if live_px is not None: c_c.caption(f"Mkt ${live_px:.2f}")
-                        
-                        # [FIXED] PnL Display Logic
-                        if leg_pnl is not None: 
-                            p_color = "#00c853" if leg_pnl >= 0 else "#f44336"
-                            c_d.markdown(f"<span style='color:{p_color}; font-weight:bold'>${leg_pnl:.2f}</span>", unsafe_allow_html=True)
-                        else:
-                            c_d.markdown(f"<span style='color:#555; font-size:0.8rem;'>--</span>", unsafe_allow_html=True)
-                
-                # Buttons
-                c_act1, c_act2, c_act3, c_act4 = st.columns([1, 1, 3, 1])
-                if status == "WORKING":
-                    with c_act1:
-                        fill_px = st.number_input("Fill Px", value=limit, key=f"f_{t_id}", label_visibility="collapsed")
-                    with c_act2:
-                        if st.button("Fill", key=f"b_fill_{t_id}"):
-                            db.update_trade_status(t_id, "OPEN", fill_px)
-                            # [IMPORTANT] Update leg entry prices with the live prices captured in t['legs']
-                            if 'legs' in t: db.update_leg_entry_prices(t_id, t['legs'])
-                            st.rerun()
-                    with c_act4:
-                        if st.button("Cancel", key=f"b_can_{t_id}"):
-                            db.update_trade_status(t_id, "CLOSED"); st.rerun()
-                elif status == "OPEN":
-                    with c_act4:
-                        if st.button("Close", key=f"b_cls_{t_id}"):
-                            db.update_trade_status(t_id, "CLOSED"); st.rerun()
-            
-            # Tiny spacer between cards
-            st.markdown("<div style='margin-bottom: 8px;'></div>", unsafe_allow_html=True)
+            _render_trade_card(t, db)
 
-if st.session_state.auto_refresh and time.time() - st.session_state.last_refresh_time > 300:
-    load_radar_with_deltas.clear()
-    st.session_state.last_refresh_time = time.time()
-    st.rerun()
\ No newline at end of file
+# ==========================================
+# Auto-Refresh: 浏览器端定时器驱动 fragment，每 5s 只重跑这一小段，不阻塞脚本线程
+# ==========================================
+AUTO_REFRESH_SEC = 300
+
+@st.fragment(run_every=5)
+def _auto_refresh_tick():
+    if not st.session_state.get("auto_refresh"):
+        return
+    elapsed = time.time() - st.session_state.last_refresh_time
+    if elapsed >= AUTO_REFRESH_SEC:
+        load_radar_with_deltas.clear()
+        st.session_state.last_refresh_time = time.time()
+        st.rerun()
+    else:
+        st.caption(f"⏳ Auto-refresh in {AUTO_REFRESH_SEC - int(elapsed)}s")
+
+_auto_refresh_tick()
\ No newline at end of file
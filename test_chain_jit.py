@@ -0,0 +1,29 @@
+import sys
+import os
+
+# 1. 路径设置
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, "src"))
+
+import numpy as np
+
+from trade_guardian.domain.chain import _best_delta_match
+from trade_guardian.infra.jit import HAS_NUMBA
+
+
+def test_best_delta_match_nan_deltas():
+    """Schwab 链里的 NaN delta 不能被选中；JIT 结果必须与纯 Python (py_func) 一致。"""
+    abs_deltas = np.array([0.5, np.nan, 0.31, 0.12, 0.05, np.nan, 0.29])
+    targets = np.array([0.30, 0.10])
+
+    got = _best_delta_match(abs_deltas, targets, 0.01)
+    assert got.tolist() == [2, 3], got
+
+    if HAS_NUMBA:
+        ref = _best_delta_match.py_func(abs_deltas, targets, 0.01)
+        assert got.tolist() == ref.tolist(), (got, ref)
+
+
+if __name__ == "__main__":
+    test_best_delta_match_nan_deltas()
+    print(f"✅ _best_delta_match NaN check passed (numba={HAS_NUMBA})")
@@ -0,0 +1,64 @@
+import sys
+import os
+
+# 1. 路径设置
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, "src"))
+
+import math
+import random
+
+from trade_guardian.strategies.iron_condor import _ic_arith
+from trade_guardian.infra.jit import HAS_NUMBA
+
+NAN = float("nan")
+
+
+def _cases(n=400, seed=3):
+    """随机报价 + 0 / NaN mark，四条腿独立抽样；strike 正常排列。"""
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(n):
+        quote = lambda: rnd.choice([NAN, 0.0]) if rnd.random() < 0.15 else rnd.uniform(0.01, 6.0)
+        s_put = rnd.uniform(80, 98)
+        s_call = rnd.uniform(102, 120)
+        out.append((
+            quote(), quote(), quote(), quote(),
+            s_put, s_put - rnd.choice([1.0, 2.5, 5.0]),
+            s_call, s_call + rnd.choice([1.0, 2.5, 5.0]),
+            NAN if rnd.random() < 0.1 else rnd.uniform(0, 100),
+            rnd.choice([0.05, 0.10, 0.16]),
+            rnd.random() < 0.2,
+        ))
+    return out
+
+
+def _same(a, b):
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    return a == b
+
+
+def test_ic_arith_jit_matches_py_func():
+    """JIT 版 _ic_arith 必须与纯 Python (py_func) 逐项一致，包括 NaN 报价。"""
+    if not HAS_NUMBA:
+        return
+    for args in _cases():
+        got = tuple(_ic_arith(*args))
+        ref = tuple(_ic_arith.py_func(*args))
+        assert all(_same(float(g), float(r)) for g, r in zip(got, ref)), (args, got, ref)
+
+
+def test_ic_arith_nan_quote_not_rich():
+    """NaN 报价算不出 RoR：不能加 RoR 分，也不能打 RICH tag。"""
+    f = _ic_arith.py_func if HAS_NUMBA else _ic_arith
+    score, _, _, _, ror, _, tag_code = f(NAN, 0.5, 1.2, 0.4, 95.0, 90.0, 105.0, 110.0, 60.0, 0.16, False)
+    assert math.isnan(ror)
+    assert tag_code & 2 == 0, tag_code
+    assert score == 60, score
+
+
+if __name__ == "__main__":
+    test_ic_arith_jit_matches_py_func()
+    test_ic_arith_nan_quote_not_rich()
+    print(f"✅ _ic_arith NaN / JIT parity checks passed (numba={HAS_NUMBA})")
@@ -0,0 +1,62 @@
+import sys
+import os
+
+# 1. 路径设置
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, "src"))
+
+import math
+import random
+from types import SimpleNamespace
+
+from trade_guardian.domain.models import Context
+from trade_guardian.infra.config import DEFAULT_CONFIG
+from trade_guardian.strategies.long_gamma import LongGammaStrategy
+
+NAN, INF = float("nan"), float("inf")
+# 缺失 / 异常的期限结构数据，与正常值混在一起跑
+_EDGES = [NAN, INF, -INF, 0.0, 0.05, 0.16, 0.31, -0.6, 0.9]
+
+
+def _same(a, b):
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    return a == b
+
+
+def _make_ctxs(n=500, seed=7):
+    rnd = random.Random(seed)
+    ctxs = []
+    for i in range(n):
+        pick = lambda: rnd.choice(_EDGES) if rnd.random() < 0.3 else rnd.uniform(-1, 1)
+        tsf = dict(
+            short_iv=30.0, short_dte=rnd.randint(8, 30), short_exp="2026-11-20",
+            edge_micro=pick(), edge_month=pick(),
+        )
+        ctxs.append(Context(
+            symbol=rnd.choice(["AAPL", "SPY", "TQQQ"]), price=100.0, iv=None, hv=None, tsf=tsf,
+            raw_chain={}, metrics=SimpleNamespace(gamma=rnd.random()), term=[],
+        ))
+    return ctxs
+
+
+def test_lg_batch_matches_scalar():
+    """evaluate_batch 必须与逐行 evaluate 完全一致 (含 NaN / inf edge)。"""
+    strat = LongGammaStrategy(DEFAULT_CONFIG, None)
+    ctxs = _make_ctxs()
+    scalar = [strat.evaluate(c) for c in ctxs]
+    batch = strat.evaluate_batch(ctxs)
+    assert len(scalar) == len(batch)
+
+    for c, x, y in zip(ctxs, scalar, batch):
+        key = (c.tsf["edge_micro"], c.tsf["edge_month"])
+        assert (x.cal_score, x.tag, x.short_risk) == (y.cal_score, y.tag, y.short_risk), (key, x.cal_score, y.cal_score)
+        assert 0 <= y.cal_score <= 100, (key, y.cal_score)
+        assert x.meta.keys() == y.meta.keys()
+        for k in x.meta:
+            assert _same(x.meta[k], y.meta[k]), (key, k, x.meta[k], y.meta[k])
+
+
+if __name__ == "__main__":
+    test_lg_batch_matches_scalar()
+    print("✅ LongGamma evaluate_batch == evaluate (incl. NaN/inf edges)")
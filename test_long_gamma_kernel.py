@@ -0,0 +1,54 @@
+import sys
+import os
+
+# 1. 路径设置
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, "src"))
+
+import math
+
+from trade_guardian.strategies.long_gamma import _lg_kernel
+from trade_guardian.infra.jit import HAS_NUMBA
+
+NAN, INF = float("nan"), float("inf")
+
+# (edge_micro, edge_month, chain_gamma)
+CASES = [
+    (0.20, 0.40, 0.02),
+    (-0.60, -0.50, 0.01),
+    (0.04, 0.12, 0.0),
+    (NAN, 0.10, 0.01),
+    (0.10, NAN, 0.01),
+    (NAN, NAN, 0.0),
+    (INF, 0.10, 0.01),
+    (0.10, -INF, 0.01),
+]
+
+
+def _py(*args):
+    # 没装 numba 时 njit 是 no-op，kernel 本身就是纯 Python
+    return _lg_kernel.py_func(*args) if HAS_NUMBA else _lg_kernel(*args)
+
+
+def test_lg_kernel_nan_edges():
+    """缺失的 edge (NaN/inf) 记 0 分、不打 tag；纯 Python 版不能抛 ValueError。"""
+    for em, ek, g in CASES:
+        score, tag_code, est_gamma = _py(em, ek, g)
+        if not (math.isfinite(em) and math.isfinite(ek)):
+            assert (score, tag_code) == (0, 0), (em, ek, score, tag_code)
+        assert est_gamma == g * 2.0
+
+
+def test_lg_kernel_jit_matches_py_func():
+    if not HAS_NUMBA:
+        return
+    for args in CASES:
+        got = tuple(_lg_kernel(*args))
+        ref = tuple(_lg_kernel.py_func(*args))
+        assert got == ref, (args, got, ref)
+
+
+if __name__ == "__main__":
+    test_lg_kernel_nan_edges()
+    test_lg_kernel_jit_matches_py_func()
+    print(f"✅ _lg_kernel NaN / JIT parity checks passed (numba={HAS_NUMBA})")
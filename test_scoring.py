@@ -0,0 +1,50 @@
+import sys
+import os
+
+# 1. 路径设置
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, "src"))
+
+from trade_guardian.domain.scoring import Scoring, ScoringRules
+
+NAN, INF = float("nan"), float("inf")
+
+
+def _ladder(rules: ScoringRules, hv_rank: float) -> int:
+    """原 if/elif 阶梯 (bisect 版必须与它逐值一致)。"""
+    r = float(hv_rank)
+    if r <= rules.hv_low_rank:
+        return int(rules.hv_low_bonus)
+    if r <= rules.hv_mid_rank:
+        return int(rules.hv_mid_bonus)
+    if r <= rules.hv_high_rank:
+        return int(rules.hv_high_penalty)
+    return int(rules.hv_extreme_penalty)
+
+
+def test_hv_points_matches_ladder():
+    rules = ScoringRules(hv_enabled=True)
+    sc = Scoring(rules)
+    # 边界值 (右闭区间) + 区间内部 + 缺失数据
+    ranks = [-INF, 0.0, 19.9, 20.0, 20.1, 35.0, 50.0, 50.1, 69.9, 70.0, 70.1, 100.0, INF, NAN]
+    for r in ranks:
+        assert sc._hv_points(r) == _ladder(rules, r), (r, sc._hv_points(r), _ladder(rules, r))
+
+
+def test_hv_points_nan_is_penalty():
+    """没有 HV 数据不能变成 bonus。"""
+    rules = ScoringRules(hv_enabled=True)
+    assert Scoring(rules)._hv_points(NAN) == rules.hv_extreme_penalty
+
+
+def test_hv_points_disabled():
+    sc = Scoring(ScoringRules(hv_enabled=False))
+    assert sc._hv_points(NAN) == 0
+    assert sc._hv_points(10.0) == 0
+
+
+if __name__ == "__main__":
+    test_hv_points_matches_ladder()
+    test_hv_points_nan_is_penalty()
+    test_hv_points_disabled()
+    print("✅ Scoring._hv_points matches the if/elif ladder (incl. NaN)")
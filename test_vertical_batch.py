@@ -0,0 +1,77 @@
+import sys
+import os
+
+# 1. 路径设置
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, "src"))
+
+import math
+import random
+from types import SimpleNamespace
+
+from trade_guardian.domain.models import Context
+from trade_guardian.infra.config import DEFAULT_CONFIG
+from trade_guardian.strategies.vertical_credit import VerticalCreditStrategy
+
+NAN = float("nan")
+
+
+def _chain(rnd):
+    """最小 Schwab 链：单个到期日，PUT/CALL 各一排 strike；部分 mark 为 0 或 NaN。"""
+    m = {}
+    for side, key in (("CALL", "callExpDateMap"), ("PUT", "putExpDateMap")):
+        strikes = {}
+        for k in range(60, 141):
+            d = rnd.uniform(0, 1) * (1 if side == "CALL" else -1)
+            u = rnd.random()
+            mark = NAN if u < 0.1 else 0.0 if u < 0.2 else rnd.uniform(0.05, 10)
+            strikes[f"{float(k):.1f}"] = [{"delta": d, "mark": mark, "bid": 1, "ask": 2}]
+        m[key] = {"2026-11-20:36": strikes}
+    return m
+
+
+def _make_ctxs(n=300, seed=11):
+    rnd = random.Random(seed)
+    ctxs = []
+    for _ in range(n):
+        tsf = dict(
+            month_exp="2026-11-20", month_dte=rnd.choice([10, 36, 36]),
+            short_exp="2026-10-23", short_dte=8, short_iv=30.0,
+        )
+        hv_rank = NAN if rnd.random() < 0.1 else rnd.uniform(0, 100)
+        ctxs.append(Context(
+            symbol="AAPL", price=rnd.choice([90.0, 100.0, 130.0]), iv=None,
+            hv=SimpleNamespace(hv_rank=hv_rank), tsf=tsf, raw_chain=_chain(rnd),
+        ))
+    return ctxs
+
+
+def _same(a, b):
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    return a == b
+
+
+def test_vertical_batch_matches_scalar():
+    """evaluate_batch 必须与逐个 evaluate 一致 (含 NaN / 0 mark 导致的 NaN RoR)。"""
+    strat = VerticalCreditStrategy(DEFAULT_CONFIG, None)
+    ctxs = _make_ctxs()
+    scalar = [strat.evaluate(c) for c in ctxs]
+    batch = strat.evaluate_batch(ctxs)
+    assert len(scalar) == len(batch)
+
+    nan_ror = 0
+    for x, y in zip(scalar, batch):
+        assert (x.tag, x.cal_score, x.short_risk) == (y.tag, y.cal_score, y.short_risk), (x.tag, x.cal_score, y.cal_score)
+        assert x.meta.keys() == y.meta.keys()
+        for k in x.meta:
+            assert _same(x.meta[k], y.meta[k]), (k, x.meta[k], y.meta[k])
+        assert x.blueprint.note == y.blueprint.note
+        assert x.blueprint.legs == y.blueprint.legs
+        nan_ror += "RoR nan" in (x.blueprint.note or "")
+    assert nan_ror, "fixture should produce NaN RoR rows"
+
+
+if __name__ == "__main__":
+    test_vertical_batch_matches_scalar()
+    print("✅ VerticalCredit evaluate_batch == evaluate (incl. NaN/0 marks)")